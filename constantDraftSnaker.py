@@ -1,120 +1,235 @@
-import pandas as pd
 import numpy as np
 import heapq
-import copy
-import threading
-
-# Function to calculate z-scores for players
-def calculate_z_scores(df, categories):
-    z_scores = pd.DataFrame()
-    for cat in categories:
-        if cat in ['fg%', 'ft%']:
-            continue  # Skip percentages for now
-        mean = df[cat].mean()
-        std = df[cat].std()
-        if std == 0:
-            z_scores[cat] = 0
-        else:
-            z_scores[cat] = (df[cat] - mean) / std
-    # Handle percentages separately
-    for cat in ['fg%', 'ft%']:
-        mean = df[cat].mean()
-        std = df[cat].std()
-        if std == 0:
-            z_scores[cat] = 0
-        else:
-            z_scores[cat] = (df[cat] - mean) / std
-    # Turnovers are minimized
-    if 'TOs' in z_scores.columns:
-        z_scores['TOs'] = -z_scores['TOs']  # Since fewer turnovers are better
-    # Sum z-scores across all categories
-    z_scores['total_z'] = z_scores.sum(axis=1)
-    df['total_z'] = z_scores['total_z']
-    return df
-
-# Function to aggregate team statistics
-def aggregate_team_stats(team, df):
-    stats = {
-        'fgm': 0.0, 'fga': 0.0, 'ftm': 0.0, 'fta': 0.0,
-        '3pm': 0.0, 'reb': 0.0, 'ass': 0.0, 'stl': 0.0,
-        'bl': 0.0, 'TOs': 0.0, 'ppg': 0.0
-    }
-    for player in team:
-        player_stats = df[df['Name'] == player]
-        if player_stats.empty:
-            continue  # Skip if player not found
-        player_stats = player_stats.iloc[0]
-        for key in stats.keys():
-            stats[key] += float(player_stats.get(key, 0))
-    # Calculate percentages
-    stats['fg%'] = (stats['fgm'] / stats['fga']) * 100 if stats['fga'] != 0 else 0
-    stats['ft%'] = (stats['ftm'] / stats['fta']) * 100 if stats['fta'] != 0 else 0
-    return stats
-
-# Function to calculate roto standings
-def calculate_roto_standings(teams_stats):
-    categories = ['ppg', 'reb', 'ass', 'stl', 'bl', 'fg%', 'ft%', '3pm', 'TOs']
-    teams_scores = {team: {} for team in teams_stats.keys()}
-    # Prepare category data
-    category_data = {cat: [] for cat in categories}
-    for team, stats in teams_stats.items():
-        for cat in categories:
-            value = stats.get(cat, 0)
-            if cat == 'TOs':
-                category_data[cat].append((team, -value))  # Negative because TOs are minimized
-            else:
-                category_data[cat].append((team, value))
-    # Rank teams in each category
-    for cat in categories:
-        # Handle possible NaN values
-        category_values = [(team, value if not np.isnan(value) else 0) for team, value in category_data[cat]]
-        category_values.sort(key=lambda x: x[1], reverse=True)
-        for rank, (team, value) in enumerate(category_values, start=1):
-            teams_scores[team][cat] = len(teams_stats) - rank + 1  # Higher value gets higher rank
-    return teams_scores
-
-# Function to evaluate total roto score
-def evaluate_roto_score(team_scores):
-    total_score = sum(team_scores.values())
-    return total_score
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from playerStore import STAT_COLUMNS, AvailabilityIndex, totals_to_stats, share_player_store, attach_player_store
+from rotoStandings import CATEGORIES, totals_to_categories, rank_roto_standings
+from opponentRollouts import rollout_log_weights, rollout_roto_scores, summarize_rollouts
+from searchTrace import SearchTrace, trace_clock
+from resultWriter import DEFAULT_OUTPUTS, open_result_writer, completed_positions
+from playerData import load_player_store
+from runningZScores import RunningZScores
+
+# Chance an opponent takes each of the top players available to them, best first
+OPPONENT_PICK_PROBS = [0.5, 0.3, 0.15, 0.05]
+
+# Raised by the beam search when its deadline passes before the draft is complete
+class DeadlineExceeded(Exception):
+    def __init__(self, depth, beam_size):
+        super().__init__(f"Deadline passed after {depth} picks with {beam_size} states in the beam")
+        self.depth = depth  # Picks fully searched
+        self.beam_size = beam_size
+
+# Class for what every state of one search shares: the league and the player pool
+class DraftContext:
+    __slots__ = ['pick_order', 'our_index', 'names', 'zobrist', 'z_engine']
+
+    def __init__(self, pick_order, names, zobrist, z_engine=None):
+        self.pick_order = pick_order  # List of team names in pick order
+        self.our_index = pick_order.index('OurTeam')
+        self.names = names  # Player names by ID, only read when rosters are output
+        self.zobrist = zobrist  # Teams x players random keys
+        self.z_engine = z_engine  # RunningZScores, when ranking by the remaining pool
 
 # Class to represent a draft state
+# States are persistent: a child shares everything with its parent except the new pick,
+# the availability bitmask and the small per-team totals array, so creating one is O(1)
+# in pool and roster size. Rosters are materialized by walking the parent chain, and
+# names only when they are output.
+# key is a Zobrist hash of every (team, player) pick, so states holding the same rosters
+# reached in a different pick order share a key.
+# With a RunningZScores engine, each state also carries the z-score moments of its remaining
+# pool, updated per pick in O(categories).
+# evaluate_states packs every team's category points into points (int8 bytes); standings,
+# category rankings and the second-best team are derived from them on demand.
 class DraftState:
-    def __init__(self, our_team, available_players, round_number, pick_order, teams_rosters, teams_stats):
-        self.our_team = our_team  # List of our players
-        self.available_players = available_players  # Set of available players
+    __slots__ = ['round_number', 'context', 'available', 'team_totals', 'parent', 'team_index', 'player_id', 'cursors',
+                 'key', 'z_moments', 'our_count', 'rollout_stats', 'points', 'total_roto_score', 'priority']
+
+    def __init__(self, round_number, pick_order, available, team_totals, parent=None, team_index=None, player_id=None,
+                 names=None, zobrist=None, z_engine=None, z_moments=None):
         self.round_number = round_number
-        self.pick_order = pick_order  # List of team names in pick order
-        self.teams_rosters = teams_rosters  # Dict of teams' rosters
-        self.teams_stats = teams_stats  # Dict of teams' aggregated stats
-        # Evaluate projected roto score
-        teams_scores = calculate_roto_standings(self.teams_stats)
-        self.total_roto_score = evaluate_roto_score(teams_scores['OurTeam'])
-        self.priority = -self.total_roto_score  # Negative because heapq is a min-heap
-        # Store category rankings
-        self.category_rankings = teams_scores['OurTeam']
-        # Store second-best team info for sanity check
-        total_scores = [(name, evaluate_roto_score(scores)) for name, scores in teams_scores.items()]
-        total_scores.sort(key=lambda x: x[1], reverse=True)
-        self.standings = total_scores
-        if total_scores[0][0] != 'OurTeam':
-            self.second_best_team = total_scores[0][0]
-            self.second_best_score = total_scores[0][1]
-        else:
-            self.second_best_team = total_scores[1][0]
-            self.second_best_score = total_scores[1][1]
-        self.second_best_category_rankings = teams_scores[self.second_best_team]
-        self.second_best_team_roster = self.teams_rosters[self.second_best_team]
+        self.context = parent.context if parent is not None else DraftContext(pick_order, names, zobrist, z_engine)
+        self.available = available  # Bitmask of available player IDs
+        self.team_totals = team_totals  # Teams x STAT_COLUMNS running totals, in pick_order
+        self.parent = parent  # Previous state in the pick chain
+        self.team_index = team_index  # Team that made the pick leading to this state
+        self.player_id = player_id  # Player taken in that pick
+        self.cursors = parent.cursors if parent is not None else {}  # AvailabilityIndex -> scan cursor (copy-on-write)
+        self.key = parent.child_key(team_index, player_id) if player_id is not None else 0
+        self.z_moments = z_moments  # Remaining pool's z-score moments, when z_engine is set
+        self.our_count = parent.our_count if parent is not None else 0
+        self.rollout_stats = parent.rollout_stats if parent is not None else None  # Set by opponent rollouts
+        self.points = None
+        if player_id is not None and team_index == self.context.our_index:
+            self.our_count += 1
+
+    @property
+    def pick_order(self):
+        return self.context.pick_order
+
+    @property
+    def our_index(self):
+        return self.context.our_index
+
+    @property
+    def names(self):
+        return self.context.names
+
+    @property
+    def zobrist(self):
+        return self.context.zobrist
+
+    @property
+    def z_engine(self):
+        return self.context.z_engine
+
+    # Drop what only the search frontier needs once this state is just an ancestor
+    # Rosters still walk through it; searching or scoring from it afterwards is not supported.
+    def release(self):
+        self.team_totals = None
+        self.z_moments = None
+        self.cursors = None
+        self.points = None
+
+    # Create the state after a team picks a player; call evaluate_states afterwards
+    def child(self, round_number, team_index, player_id, store):
+        player_id = int(player_id)
+        team_totals = self.team_totals.copy()
+        team_totals[team_index] += store.matrix[player_id]
+        z_moments = None if self.z_engine is None else self.z_engine.without(self.z_moments, player_id)
+        return DraftState(round_number, self.pick_order, self.available & ~(1 << player_id), team_totals,
+                          parent=self, team_index=team_index, player_id=player_id, z_moments=z_moments)
+
+    # Hash key of the state after a team picks a player
+    def child_key(self, team_index, player_id):
+        return self.key ^ self.zobrist[team_index][player_id]
+
+    # First n available player IDs by the index's ranking, remembering where the scan starts
+    def top_available(self, index, n):
+        cursor = index.advance(self.available, self.cursors.get(index, 0))
+        if cursor != self.cursors.get(index, 0):
+            self.cursors = dict(self.cursors)
+            self.cursors[index] = cursor
+        return index.top_available(self.available, n, cursor)
+
+    # First n available player IDs by total z-score against the remaining pool
+    def top_remaining(self, n):
+        return self.z_engine.top_available(self.available, n, self.z_moments)
+
+    # Player IDs picked by a team, in pick order
+    def roster_ids(self, team_index):
+        ids = []
+        state = self
+        while state is not None:
+            if state.player_id is not None and state.team_index == team_index:
+                ids.append(state.player_id)
+            state = state.parent
+        return ids[::-1]
+
+    def roster(self, team_index):
+        return [self.names[player_id] for player_id in self.roster_ids(team_index)]
+
+    @property
+    def our_team(self):
+        return self.roster(self.our_index)
+
+    @property
+    def teams_rosters(self):
+        return {team: self.roster(i) for i, team in enumerate(self.pick_order)}
+
+    # Category points of every team (teams x CATEGORIES), unpacked from the evaluation
+    @property
+    def league_points(self):
+        return np.frombuffer(self.points, dtype=np.int8).reshape(len(self.pick_order), len(CATEGORIES))
+
+    @property
+    def category_rankings(self):
+        return dict(zip(CATEGORIES, self.league_points[self.our_index].tolist()))
+
+    # Teams and total roto scores, best first
+    @property
+    def standings(self):
+        scores = self.league_points.sum(axis=1).tolist()
+        return sorted(zip(self.pick_order, scores), key=lambda x: x[1], reverse=True)
+
+    # Best team other than ours and its score, for the sanity check in the results
+    @property
+    def second_best(self):
+        return next((name, score) for name, score in self.standings if name != 'OurTeam')
+
+    @property
+    def second_best_team(self):
+        return self.second_best[0]
+
+    @property
+    def second_best_score(self):
+        return self.second_best[1]
+
+    @property
+    def second_best_category_rankings(self):
+        return dict(zip(CATEGORIES, self.league_points[self.pick_order.index(self.second_best_team)].tolist()))
+
+    @property
+    def second_best_team_roster(self):
+        return self.roster(self.pick_order.index(self.second_best_team))
+
+    # Teams' aggregated stats, with fg% and ft% derived from the running totals
+    @property
+    def teams_stats(self):
+        return {team: totals_to_stats(self.team_totals[i]) for i, team in enumerate(self.pick_order)}
 
     def __lt__(self, other):
         return self.priority < other.priority
 
+# Function to evaluate projected roto scores for a batch of draft states in one ranking call
+def evaluate_states(states, trace=None):
+    if not states:
+        return
+    clock = trace_clock(trace)
+    start = clock()
+    our_index = states[0].our_index
+    values = totals_to_categories(np.stack([state.team_totals for state in states]))
+    ranked = clock()
+    points, total_scores = rank_roto_standings(values)
+    # Points never exceed the number of teams, so each state keeps its league's points as int8 bytes
+    packed = points.astype(np.int8)
+    for state, state_points, score in zip(states, packed, total_scores[:, our_index].tolist()):
+        state.total_roto_score = score
+        state.priority = -score  # Negative because heapq is a min-heap
+        state.points = state_points.tobytes()
+    if trace is not None:
+        trace.add_time('aggregation', ranked - start)
+        trace.add_time('ranking', clock() - ranked)
+
+# Function to build the Zobrist table of random 64-bit keys for (team, player) picks
+# A fixed seed keeps it independent of the global RNG used for opponent sampling.
+def zobrist_table(num_teams, num_players, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2**63, size=(num_teams, num_players), dtype=np.int64).tolist()
+
 # Function to simulate the draft using beam search with expanded search space
-def simulate_draft_beam_search(df, draft_position, num_teams=10, beam_width=50, top_n=10):
+# Our candidates are the top_n available players by total_z, or with z_ranking='remaining'
+# by z-scores against the pool still available in each state; opponent_index optionally
+# ranks the opponents' choices by another key (e.g. an ADP AvailabilityIndex).
+# With rollouts > 0, the states created by our picks are ranked by their expected roto
+# score over that many sampled completions of the draft instead of the current standings.
+# Pass a SearchTrace as trace to record per-pick state counts and phase timings.
+# With transpositions on, expanded states holding the same rosters as one already
+# generated at this pick are merged before scoring, so the beam keeps distinct teams.
+# With a deadline (a time.perf_counter() value), DeadlineExceeded is raised at the first
+# pick that starts after it.
+def simulate_draft_beam_search(store, draft_position, num_teams=10, beam_width=50, top_n=10, opponent_index=None,
+                               rollouts=0, rollout_decay=0.6, trace=None, transpositions=True, z_ranking='pool',
+                               deadline=None):
+    if z_ranking not in ['pool', 'remaining']:
+        raise ValueError(f"Unknown z-score ranking: {z_ranking}")
     # Initialize variables
     draft_order = ['Team' + str(i+1) for i in range(num_teams)]
     draft_order[draft_position - 1] = 'OurTeam'  # Replace with our team
     num_rounds = 13
+    num_players = len(store)
 
     # Generate the full draft sequence (snake draft)
     draft_sequence = []
@@ -124,163 +239,268 @@ def simulate_draft_beam_search(df, draft_position, num_teams=10, beam_width=50,
         else:
             draft_sequence.extend(draft_order[::-1])
 
+    # Player IDs ordered by total_z, best first
+    z_index = AvailabilityIndex(store.total_z)
+    if opponent_index is None:
+        opponent_index = z_index
+
+    if rollouts:
+        log_weights = rollout_log_weights(opponent_index, num_players, rollout_decay)
+        sequence_indices = np.array([draft_order.index(drafter) for drafter in draft_sequence])
+
+    # Running moments of the remaining pool, carried per state when ranking by them
+    z_engine = RunningZScores(store) if z_ranking == 'remaining' else None
+
     # Initial state
     initial_state = DraftState(
-        our_team=[],
-        available_players=set(df['Name'].values),
         round_number=1,
         pick_order=draft_order,
-        teams_rosters={team: [] for team in draft_order},
-        teams_stats={team: {} for team in draft_order}
+        available=(1 << num_players) - 1,
+        team_totals=np.zeros((num_teams, len(STAT_COLUMNS))),
+        names=store.names,
+        zobrist=zobrist_table(num_teams, num_players),
+        z_engine=z_engine,
+        z_moments=None if z_engine is None else z_engine.moments.copy()
     )
+    evaluate_states([initial_state])
 
     # Beam search initialization
     beam = [initial_state]
     best_teams = []
 
     # Opponent pick probabilities
-    opponent_pick_probs = [0.5, 0.3, 0.15, 0.05]  # Probabilities for top 4 players
+    opponent_pick_probs = list(OPPONENT_PICK_PROBS)  # Probabilities for top 4 players
     opponent_pick_probs += [0] * (top_n - len(opponent_pick_probs))  # Pad with zeros if necessary
 
+    # Phase clock; a no-op returning 0 when tracing is off
+    clock = trace_clock(trace)
+
     # Start beam search
     for pick_index, drafter in enumerate(draft_sequence):
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise DeadlineExceeded(pick_index, len(beam))
         new_beam = []
+        round_number = (pick_index // num_teams) + 1
+        team_index = draft_order.index(drafter)
+        if trace is not None:
+            trace.start_pick(pick_index, round_number, drafter, len(beam))
+        selection_time = copying_time = sampling_time = 0.0
+        # Transposition table: keys of the states generated at this pick
+        seen = set()
+        merged = 0
         for state in beam:
-            # Copy state to avoid modifying original
-            state_copy = copy.deepcopy(state)
-            # Update round number
-            state_copy.round_number = (pick_index // num_teams) + 1
-
+            start = clock()
             if drafter == 'OurTeam':
                 # Our pick
                 # Consider top N available players based on total_z
-                available_df = df[df['Name'].isin(state_copy.available_players)].copy()
-                available_df.sort_values(by='total_z', ascending=False, inplace=True)
-                top_players = available_df.head(top_n)['Name'].values
-
-                for player in top_players:
-                    new_state = copy.deepcopy(state_copy)
-                    new_state.our_team.append(player)
-                    new_state.available_players.remove(player)
-                    # Update team rosters and stats
-                    new_state.teams_rosters['OurTeam'] = new_state.our_team
-                    new_state.teams_stats['OurTeam'] = aggregate_team_stats(new_state.our_team, df)
-                    # Update state
-                    new_state = DraftState(
-                        our_team=new_state.our_team,
-                        available_players=new_state.available_players,
-                        round_number=new_state.round_number,
-                        pick_order=new_state.pick_order,
-                        teams_rosters=new_state.teams_rosters,
-                        teams_stats=new_state.teams_stats
-                    )
-                    new_beam.append(new_state)
+                if z_engine is not None:
+                    top_players = state.top_remaining(top_n)
+                else:
+                    top_players = state.top_available(z_index, top_n)
+                selected = clock()
+                for player_id in top_players:
+                    if transpositions:
+                        # Same rosters mean the same totals and score, so keep the first copy
+                        key = state.child_key(team_index, player_id)
+                        if key in seen:
+                            merged += 1
+                            continue
+                        seen.add(key)
+                    new_beam.append(state.child(round_number, team_index, player_id, store))
+                selection_time += selected - start
+                copying_time += clock() - selected
             else:
                 # Opponent's pick
-                if state_copy.available_players:
-                    available_df = df[df['Name'].isin(state_copy.available_players)].copy()
-                    available_df.sort_values(by='total_z', ascending=False, inplace=True)
-                    top_opponent_players = available_df.head(top_n)['Name'].values
+                top_players = state.top_available(opponent_index, top_n)
+                selected = clock()
+                if len(top_players) > 0:
                     # Determine opponent pick based on probabilities
-                    opponent_pick = np.random.choice(
-                        top_opponent_players,
-                        p=opponent_pick_probs[:len(top_opponent_players)] / np.sum(opponent_pick_probs[:len(top_opponent_players)])
-                    )
-                    state_copy.available_players.remove(opponent_pick)
-                    # Add the player to the opponent's team
-                    state_copy.teams_rosters[drafter].append(opponent_pick)
-                    # Update opponent's team stats
-                    state_copy.teams_stats[drafter] = aggregate_team_stats(state_copy.teams_rosters[drafter], df)
-                    # Update our team's stats (unchanged)
-                    state_copy.teams_rosters['OurTeam'] = state_copy.our_team
-                    state_copy.teams_stats['OurTeam'] = aggregate_team_stats(state_copy.our_team, df)
-                    # Update state
-                    state_copy = DraftState(
-                        our_team=state_copy.our_team,
-                        available_players=state_copy.available_players,
-                        round_number=state_copy.round_number,
-                        pick_order=state_copy.pick_order,
-                        teams_rosters=state_copy.teams_rosters,
-                        teams_stats=state_copy.teams_stats
+                    pick = np.random.choice(
+                        len(top_players),
+                        p=opponent_pick_probs[:len(top_players)] / np.sum(opponent_pick_probs[:len(top_players)])
                     )
-                new_beam.append(state_copy)
+                    sampled = clock()
+                    key = state.child_key(team_index, top_players[pick])
+                    if transpositions and key in seen:
+                        merged += 1
+                    else:
+                        seen.add(key)
+                        new_beam.append(state.child(round_number, team_index, top_players[pick], store))
+                    sampling_time += sampled - selected
+                    copying_time += clock() - sampled
+                elif not (transpositions and state.key in seen):
+                    seen.add(state.key)
+                    new_beam.append(state)
+                selection_time += selected - start
 
-        # Prune beam to keep top K states
+        # Score every expanded state in one batched standings call
+        evaluate_states(new_beam, trace)
+        if rollouts and drafter == 'OurTeam' and new_beam:
+            start = clock()
+            scores = rollout_roto_scores(
+                store, log_weights, [state.available for state in new_beam],
+                np.stack([state.team_totals for state in new_beam]),
+                sequence_indices[pick_index + 1:], team_index, rollouts
+            )
+            for state, stats in zip(new_beam, summarize_rollouts(scores)):
+                state.rollout_stats = stats
+                state.priority = -stats['mean']
+            sampling_time += clock() - start
+
+        # Prune beam to keep top K states; the previous beam's states are now only ancestors
+        start = clock()
+        kept = {id(state) for state in new_beam}
+        for state in beam:
+            if id(state) not in kept:
+                state.release()
         beam = heapq.nsmallest(beam_width, new_beam)
 
+        if trace is not None:
+            trace.add_time('pruning', clock() - start)
+            trace.add_time('selection', selection_time)
+            trace.add_time('copying', copying_time)
+            trace.add_time('sampling', sampling_time)
+            trace.count('states_generated', len(new_beam))
+            trace.count('states_pruned', len(new_beam) - len(beam))
+            trace.count('states_merged', merged)
+            trace.end_pick(len(beam))
+
     # Collect final teams
     for state in beam:
-        if len(state.our_team) == num_rounds:
+        if state.our_count == num_rounds:
             best_teams.append(state)
 
     return best_teams
 
-# Function to run simulations for all draft positions
-def run_simulations(df, num_teams=10, beam_width=50, top_n=10):
-    output_file = 'best_teams.txt'
-    lock = threading.Lock()
+# Function to run the beam search within a time budget, widening the beam while time remains
+# Starts with a greedy search (width start_width, which always runs to completion) and
+# repeats with a wider beam as long as the previous search's time says the next one fits,
+# doubling up to max_width (None for no limit) or shrinking the step to what fits. A search
+# cut off by the deadline is abandoned. Returns the best teams of the widest complete search
+# and a report of the width and depth reached.
+# With a seed, every search samples opponents from the same seeded RNG.
+def anytime_beam_search(store, draft_position, time_budget, num_teams=10, top_n=10, start_width=1, max_width=None,
+                        seed=None, **search_options):
+    start = time.perf_counter()
+    deadline = start + time_budget
+    width = start_width
+    best_teams = []
+    report = {
+        'beam_width': 0,  # Width of the search the teams come from
+        'depth': 0,  # Picks that search completed
+        'searches': 0,
+        'interrupted_width': None,  # Width and depth of a search the deadline cut off, if any
+        'interrupted_depth': None,
+        'elapsed': 0.0
+    }
+    while True:
+        if seed is not None:
+            np.random.seed(seed)
+        search_start = time.perf_counter()
+        try:
+            best_teams = simulate_draft_beam_search(store, draft_position, num_teams, width, top_n,
+                                                    deadline=deadline if report['searches'] else None,
+                                                    **search_options)
+        except DeadlineExceeded as exceeded:
+            report['interrupted_width'] = width
+            report['interrupted_depth'] = exceeded.depth
+            break
+        finished = time.perf_counter()
+        report['beam_width'] = width
+        report['depth'] = num_teams * 13
+        report['searches'] += 1
+        # Widen while the beam still fills up; search time grows about linearly with width
+        if len(best_teams) < width or (max_width is not None and width >= max_width):
+            break
+        next_width = width * 2 if max_width is None else min(width * 2, max_width)
+        per_state = (finished - search_start) / width
+        if per_state > 0:
+            next_width = min(next_width, int((deadline - finished) / per_state))
+        if next_width <= width:
+            break
+        width = next_width
+    report['elapsed'] = time.perf_counter() - start
+    return best_teams, report
+
+# Player store attached by each worker process
+worker_store = None
+worker_shm = None
+
+# Function to attach a worker process to the shared player store
+def init_simulation_worker(descriptor):
+    global worker_store, worker_shm
+    worker_store, worker_shm = attach_player_store(descriptor)
+    np.random.seed()  # Forked workers would otherwise share the parent's RNG state
+
+# Function to run the beam search for one draft position inside a worker process
+def simulate_for_position(position, num_teams, beam_width, top_n, seed=None, rollouts=0, trace_dir=None,
+                          z_ranking='pool'):
+    if seed is not None:
+        np.random.seed(seed + position)
+    trace = None
+    if trace_dir is not None:
+        trace = SearchTrace(os.path.join(trace_dir, f'trace_position_{position}.jsonl'))
+    try:
+        best_teams = simulate_draft_beam_search(worker_store, position, num_teams, beam_width, top_n,
+                                                rollouts=rollouts, trace=trace, z_ranking=z_ranking)
+    finally:
+        if trace is not None:
+            trace.close()
     results = []
+    for state in best_teams:
+        results.append({
+            'position': position,
+            'team': state.our_team,
+            'total_roto_score': state.total_roto_score,
+            'category_rankings': state.category_rankings,
+            'second_best_team': state.second_best_team,
+            'second_best_team_roster': state.second_best_team_roster,
+            'second_best_total_roto_score': state.second_best_score,
+            'second_best_category_rankings': state.second_best_category_rankings,
+            'team_stats': state.teams_stats['OurTeam'],
+            'rollout_stats': state.rollout_stats
+        })
+    return position, results
+
+# Function to run simulations for all draft positions
+# Positions run in a process pool of max_workers (default: one per CPU); workers attach to a
+# shared-memory copy of the player store instead of receiving a pickled copy. With trace_dir
+# set, each position writes a per-pick trace file there (summarize with searchTrace.py).
+# Each position's results are written as soon as it finishes, as JSONL (default), a Parquet
+# dataset directory or the text layout; read them back with resultWriter.iter_results.
+# With resume, positions already in the output are skipped and new ones are appended.
+# z_ranking picks our candidates by whole-pool ('pool') or remaining-pool ('remaining') z-scores.
+def run_simulations(store, num_teams=10, beam_width=50, top_n=10, max_workers=None, seed=None, rollouts=0,
+                    trace_dir=None, output_format='jsonl', output_path=None, resume=False, z_ranking='pool'):
+    output_path = output_path or DEFAULT_OUTPUTS[output_format]
+    if resume and output_format == 'text':
+        raise ValueError("resume needs a structured output format (jsonl or parquet)")
+    done = completed_positions(output_path) if resume else set()
+    positions = [position for position in range(1, num_teams + 1) if position not in done]
 
-    def simulate_for_position(position):
-        best_teams = simulate_draft_beam_search(df, position, num_teams, beam_width, top_n)
-        for state in best_teams:
-            entry = {
-                'position': position,
-                'team': state.our_team,
-                'total_roto_score': state.total_roto_score,
-                'category_rankings': state.category_rankings,
-                'second_best_team': state.second_best_team,
-                'second_best_team_roster': state.second_best_team_roster,
-                'second_best_total_roto_score': state.second_best_score,
-                'second_best_category_rankings': state.second_best_category_rankings,
-                'team_stats': state.teams_stats['OurTeam']
-            }
-            with lock:
-                results.append(entry)
-
-    threads = []
-    for position in range(1, num_teams + 1):
-        t = threading.Thread(target=simulate_for_position, args=(position,))
-        t.start()
-        threads.append(t)
-
-    # Wait for all threads to finish
-    for t in threads:
-        t.join()
-
-    # Now, sort results by total roto score in descending order
-    results.sort(key=lambda x: x['total_roto_score'], reverse=True)
-
-    # Write results to output file
-    with open(output_file, 'w') as f:
-        for entry in results:
-            f.write(f"Total Roto Score: {entry['total_roto_score']}\n")
-            f.write(f"Draft Position: {entry['position']}\n")
-            f.write(f"Team: {entry['team']}\n")
-            f.write(f"Category Rankings: {entry['category_rankings']}\n")
-            f.write(f"Second Best Team: {entry['second_best_team']}\n")
-            f.write(f"Second Best Team Roster: {entry['second_best_team_roster']}\n")
-            f.write(f"Second Best Total Roto Score: {entry['second_best_total_roto_score']}\n")
-            f.write(f"Second Best Category Rankings: {entry['second_best_category_rankings']}\n")
-            f.write(f"Team Stats: {entry['team_stats']}\n")
-            f.write("=" * 40 + "\n")
+    shm, descriptor = share_player_store(store)
+    try:
+        with open_result_writer(output_format, output_path, append=resume) as writer, \
+                ProcessPoolExecutor(max_workers=max_workers, initializer=init_simulation_worker,
+                                    initargs=(descriptor,)) as executor:
+            futures = [
+                executor.submit(simulate_for_position, position, num_teams, beam_width, top_n, seed, rollouts, trace_dir,
+                                z_ranking)
+                for position in positions
+            ]
+            # Write results as each position finishes, best teams first
+            for future in as_completed(futures):
+                position, position_results = future.result()
+                position_results.sort(key=lambda x: x['total_roto_score'], reverse=True)
+                writer.write_position(position_results, position)
+                print(f"Draft position {position} finished ({len(position_results)} teams).")
+    finally:
+        shm.close()
+        shm.unlink()
 
 if __name__ == "__main__":
-    # Load the player data
-    df = pd.read_csv('players_with_estimates.csv')
-    # Ensure numerical columns are correctly typed
-    numeric_cols = ['gp', 'min', 'fgp', 'ftp', '3pm', 'reb', 'ass', 'stl', 'bl', 'TOs', 'ppg',
-                    'ftm', 'fta', 'fgm', 'fga']
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    # Calculate percentages
-    df['fg%'] = (df['fgm'] / df['fga']) * 100
-    df['ft%'] = (df['ftm'] / df['fta']) * 100
-
-    # Calculate z-scores for all players
-    categories = ['ppg', 'reb', 'ass', 'stl', 'bl', '3pm', 'fg%', 'ft%', 'TOs']
-    df = calculate_z_scores(df, categories)
+    # Load the player store, compiled from the CSV on first use and cached for later runs
+    store = load_player_store('players_with_estimates.csv')
 
     # Run simulations
-    run_simulations(df)
+    run_simulations(store)
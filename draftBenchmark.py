@@ -0,0 +1,199 @@
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from playerStore import build_player_store, aggregate_team_stats
+from rotoStandings import calculate_roto_standings
+from constantDraftSnaker import simulate_draft_beam_search
+from playerData import Z_CATEGORIES, calculate_z_scores
+from searchTrace import SearchTrace
+import rotoDraft
+
+# Version of the results file layout, bumped when fields change meaning
+BENCHMARK_SCHEMA = 1
+
+# Default sweeps; --quick shrinks them for a fast smoke run
+POOL_SIZES = [200, 1000, 10000]
+BEAM_WIDTHS = [10, 50]
+TOP_NS = [5, 10]
+NUM_TEAMS = [10, 12]
+
+# Function to generate a synthetic player pool shaped like players_with_estimates.csv
+def synthetic_player_pool(num_players, seed=0):
+    rng = np.random.default_rng(seed)
+    minutes = rng.uniform(15, 38, num_players)
+    usage = minutes / 38
+    fga = np.round(usage * rng.uniform(8, 22, num_players), 2)
+    fgp = np.round(rng.normal(0.47, 0.05, num_players).clip(0.35, 0.68), 3)
+    fta = np.round(fga * 0.25, 2)
+    ftp = np.round(rng.normal(0.78, 0.08, num_players).clip(0.5, 0.95), 3)
+    three_pm = np.round(usage * rng.uniform(0, 4, num_players), 1)
+    fgm = np.round(fga * fgp, 2)
+    ftm = np.round(fta * ftp, 2)
+    df = pd.DataFrame({
+        'Name': [f'Player {i}' for i in range(num_players)],
+        'gp': rng.integers(50, 82, num_players),
+        'min': np.round(minutes, 1),
+        'fgp': fgp,
+        'ftp': ftp,
+        '3pm': three_pm,
+        'reb': np.round(usage * rng.uniform(2, 12, num_players), 1),
+        'ass': np.round(usage * rng.uniform(1, 9, num_players), 1),
+        'stl': np.round(usage * rng.uniform(0.3, 1.8, num_players), 1),
+        'bl': np.round(usage * rng.uniform(0.1, 2.5, num_players), 1),
+        'TOs': np.round(usage * rng.uniform(0.5, 3.5, num_players), 1),
+        'ppg': np.round(2 * fgm + three_pm + ftm, 1),
+        'ftm': ftm,
+        'fta': fta,
+        'fgm': fgm,
+        'fga': fga
+    })
+    df['fg%'] = (df['fgm'] / df['fga']) * 100
+    df['ft%'] = (df['ftm'] / df['fta']) * 100
+    return calculate_z_scores(df, Z_CATEGORIES)
+
+# Function to time a callable and measure its peak traced memory in a separate run
+def measure(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(times)), peak
+
+# Function to build snake-drafted rosters for a synthetic league
+def synthetic_rosters(store, num_teams, picks_per_team):
+    teams = {f'Team{i + 1}': [] for i in range(num_teams)}
+    order = list(teams)
+    ranked = np.argsort(-store.total_z, kind='stable')
+    pick = 0
+    for round_number in range(picks_per_team):
+        for team in (order if round_number % 2 == 0 else order[::-1]):
+            teams[team].append(store.names[ranked[pick]])
+            pick += 1
+    return teams
+
+# Function to run every benchmark for one pool size
+def run_pool_benchmarks(num_players, beam_widths, top_ns, num_teams_list, repeats, seed):
+    results = []
+
+    def record(name, params, func, states=None, func_repeats=repeats):
+        wall_time, peak = measure(func, func_repeats)
+        entry = {
+            'name': name,
+            'params': dict(params, num_players=num_players),
+            'wall_time_s': wall_time,
+            'peak_memory_bytes': peak,
+            'repeats': func_repeats
+        }
+        if states is not None:
+            entry['states_expanded'] = states
+            entry['states_per_second'] = states / wall_time if wall_time > 0 else None
+        results.append(entry)
+        print(f"{name} {entry['params']}: {wall_time * 1000:.2f} ms, peak {peak / 1e6:.2f} MB")
+
+    df = synthetic_player_pool(num_players, seed)
+    record('calculate_z_scores', {}, lambda: calculate_z_scores(df.copy(), Z_CATEGORIES))
+    store = build_player_store(df)
+
+    for num_teams in num_teams_list:
+        teams = synthetic_rosters(store, num_teams, 6)
+        teams_stats = {name: aggregate_team_stats(team, store) for name, team in teams.items()}
+        record('aggregate_team_stats', {'num_teams': num_teams},
+               lambda: [aggregate_team_stats(team, store) for team in teams.values()])
+        record('calculate_roto_standings', {'num_teams': num_teams},
+               lambda: calculate_roto_standings(teams_stats))
+
+        # Suggestions for the team picking next, with the rest of the pool available
+        league = {('me' if name == 'Team1' else name): roster for name, roster in teams.items()}
+        taken = {player for roster in league.values() for player in roster}
+        available = [name for name in store.names if name not in taken]
+        record('suggest_top_picks', {'num_teams': num_teams},
+               lambda: rotoDraft.suggest_top_picks(league['me'], available, league, store, 7))
+
+        for beam_width in beam_widths:
+            for top_n in top_ns:
+                draft_position = num_teams // 2
+                trace = SearchTrace()
+
+                def search():
+                    np.random.seed(seed)
+                    trace.records = []
+                    simulate_draft_beam_search(store, draft_position, num_teams, beam_width, top_n, trace=trace)
+
+                params = {'num_teams': num_teams, 'beam_width': beam_width, 'top_n': top_n}
+                search()  # Warm-up run that also counts the states expanded
+                states = trace.summarize()['total']['states_generated']
+                record('simulate_draft_beam_search', params, search, states, func_repeats=1)
+    return results
+
+# Function to compare two results files and report slowdowns beyond the threshold
+def compare_results(baseline, current, threshold=0.10):
+    def key(entry):
+        return entry['name'], json.dumps(entry['params'], sort_keys=True)
+
+    baseline_entries = {key(entry): entry for entry in baseline['results']}
+    regressions = []
+    for entry in current['results']:
+        old = baseline_entries.get(key(entry))
+        if old is None or old['wall_time_s'] == 0:
+            continue
+        ratio = entry['wall_time_s'] / old['wall_time_s']
+        flag = ' REGRESSION' if ratio > 1 + threshold else ''
+        print(f"{entry['name']} {entry['params']}: {old['wall_time_s'] * 1000:.2f} ms -> "
+              f"{entry['wall_time_s'] * 1000:.2f} ms ({ratio:.2f}x){flag}")
+        if flag:
+            regressions.append(entry)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the draft engine hot paths.')
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to write the JSON results')
+    parser.add_argument('--compare', help='Baseline results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Slowdown ratio flagged as a regression')
+    parser.add_argument('--quick', action='store_true', help='Run a reduced sweep')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed repeats for the fast benchmarks')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for synthetic pools and opponent sampling')
+    args = parser.parse_args()
+
+    pool_sizes, beam_widths, top_ns, num_teams_list = POOL_SIZES, BEAM_WIDTHS, TOP_NS, NUM_TEAMS
+    if args.quick:
+        pool_sizes, beam_widths, top_ns, num_teams_list = [200, 1000], [10], [5], [10]
+
+    results = []
+    for num_players in pool_sizes:
+        results.extend(run_pool_benchmarks(num_players, beam_widths, top_ns, num_teams_list, args.repeats, args.seed))
+
+    output = {
+        'schema': BENCHMARK_SCHEMA,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform()
+        },
+        'seed': args.seed,
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, output, args.threshold)
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import json
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+from draftServer import DEFAULT_HOST, DEFAULT_PORT
+from rotoDraft import choose_match
+
+# Raised when the draft advisor answers with an error status
+class DraftServiceError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f"{status}: {body.get('error', body)}")
+        self.status = status
+        self.body = body
+
+# Class to talk to a running draftServer over HTTP
+class DraftClient:
+    def __init__(self, base_url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, body=None):
+        data = None if body is None else json.dumps(body).encode()
+        request = Request(self.base_url + path, data=data, method=method,
+                          headers={'Content-Type': 'application/json'})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as error:
+            raise DraftServiceError(error.code, json.loads(error.read() or b'{}')) from None
+
+    def create_session(self, draft_order, rounds=13, z_ranking='pool'):
+        return self.request('POST', '/sessions', {'draft_order': draft_order, 'rounds': rounds, 'z_ranking': z_ranking})
+
+    def sessions(self):
+        return self.request('GET', '/sessions')['sessions']
+
+    def session(self, session_id):
+        return self.request('GET', f"/sessions/{quote(session_id)}")
+
+    def pick(self, session_id, player, team=None):
+        body = {'player': player}
+        if team is not None:
+            body['team'] = team
+        return self.request('POST', f"/sessions/{quote(session_id)}/picks", body)
+
+    def suggestions(self, session_id, num_suggestions=10):
+        return self.request('GET', f"/sessions/{quote(session_id)}/suggestions?n={num_suggestions}")
+
+    def close_session(self, session_id):
+        return self.request('DELETE', f"/sessions/{quote(session_id)}")
+
+# Function to print my suggestion lists like rotoDraft does
+def print_suggestions(suggestions):
+    print("\nTop suggestions for you (Ranked by Projected Roto Score Impact):")
+    for idx, suggestion in enumerate(suggestions['by_roto_score']):
+        print(f"{idx+1}. {suggestion['player']} (Projected Roto Score: {suggestion['roto_score']}, "
+              f"Projected Rank: {suggestion['rank']}, Player Z-Score: {suggestion['z_score']:.2f})")
+    print("\nTop suggestions for you (Ranked by Player Z-Score):")
+    for idx, suggestion in enumerate(suggestions['by_z_score']):
+        print(f"{idx+1}. {suggestion['player']} (Z-Score: {suggestion['z_score']:.2f}, "
+              f"Projected Roto Score: {suggestion['roto_score']}, Projected Rank: {suggestion['rank']})")
+    print("\nTop suggestions for you (Combined Ranking):")
+    for idx, suggestion in enumerate(suggestions['combined']):
+        print(f"{idx+1}. {suggestion['player']} (Combined Score: {suggestion['combined_score']:.4f}, "
+              f"Z-Score: {suggestion['z_score']:.2f}, Projected Roto Score: {suggestion['roto_score']})")
+    endgame = suggestions.get('endgame')
+    if endgame is not None and endgame['plan']:
+        print(f"\nBest remaining picks if opponents take the top z-scores "
+              f"(Projected Roto Score: {endgame['roto_score']:.0f}): {', '.join(endgame['plan'])}")
+
+# Run an interactive draft against the service, creating a session or joining one
+def run_draft(client, session_id=None):
+    if session_id is None:
+        draft_order_input = input("Enter the draft order separated by commas (include 'me' where appropriate): ")
+        state = client.create_session(draft_order_input.strip().split(","))
+        session_id = state['session']
+        print(f"Created draft session {session_id}.")
+    else:
+        state = client.session(session_id)
+
+    while not state['complete']:
+        drafter = state['on_the_clock']
+        if drafter == 'me':
+            print_suggestions(client.suggestions(session_id))
+            prompt = f"\nRound {state['round']} - Your turn to pick! Enter the name of the player you pick: "
+        else:
+            prompt = f"Round {state['round']} - {drafter}'s turn to pick. Who did they pick? "
+        player_picked = input(prompt).strip()
+        while player_picked is not None:
+            try:
+                client.pick(session_id, player_picked, drafter)
+                player_picked = None
+            except DraftServiceError as error:
+                if error.status == 404 and error.body.get('matches'):
+                    # Let the user choose among the closest available names, then post that one
+                    player_picked = choose_match(error.body['matches'])
+                elif error.status == 409:
+                    print(error.body['error'])  # Another screen posted this pick first
+                    player_picked = None
+                else:
+                    raise
+        state = client.session(session_id)
+        my_standing = state['standings']['me']
+        print(f"\nAfter this pick, your projected roto score is {my_standing['roto_score']} "
+              f"(out of {9 * len(state['draft_order'])}).")
+
+    print(f"\nDraft complete. Your team: {state['teams']['me']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Draft against a running draftServer.')
+    parser.add_argument('--url', default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", help='Base URL of the service')
+    parser.add_argument('--session', help='Join an existing session instead of creating one')
+    args = parser.parse_args()
+    run_draft(DraftClient(args.url), args.session)
@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import itertools
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+from rotoDraft import LiveDraft
+from rotoStandings import CATEGORIES
+from playerStore import totals_to_stats
+from nameIndex import NameIndex
+from playerData import DEFAULT_CSV, load_player_store
+
+# Where the service listens by default; it is meant for the local network of one league
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1 << 20
+
+HTTP_REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# Raised by request handlers to answer with an HTTP error status and a JSON body
+class RequestError(Exception):
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.body = {'error': message, **details}
+
+# Class to hold one draft: the live draft state and a name index of the players still available
+# Picks and suggestions on a session are serialized by its lock; sessions never wait on each other.
+class DraftSession:
+    def __init__(self, session_id, store, draft_order, num_rounds=13, z_ranking='pool'):
+        self.session_id = session_id
+        self.team_names = [name.strip() for name in draft_order]
+        if 'me' not in self.team_names:
+            raise RequestError(400, "draft_order must include 'me'")
+        if len(set(self.team_names)) != len(self.team_names):
+            raise RequestError(400, "draft_order has duplicate team names")
+        if z_ranking not in ['pool', 'remaining']:
+            raise RequestError(400, f"Unknown z_ranking: {z_ranking}")
+        self.num_rounds = num_rounds
+        # Snake draft sequence, as in rotoDraft.simulate_draft
+        self.draft_sequence = []
+        for round_number in range(1, num_rounds + 1):
+            if round_number % 2 != 0:
+                self.draft_sequence.extend(self.team_names)
+            else:
+                self.draft_sequence.extend(self.team_names[::-1])
+        self.teams = {name: [] for name in self.team_names}
+        self.available_players = set(store.names)
+        self.draft = LiveDraft(store, self.team_names, self.draft_sequence, self.available_players, z_ranking)
+        self.name_index = NameIndex(self.available_players)
+        self.picks = []
+        self.lock = asyncio.Lock()
+
+    @property
+    def pick_number(self):
+        return len(self.picks)
+
+    @property
+    def current_round(self):
+        return (self.pick_number // len(self.team_names)) + 1
+
+    # Record the pick of whoever is on the clock; unknown names get the closest matches back
+    def record_pick(self, player, drafter=None):
+        if self.pick_number >= len(self.draft_sequence):
+            raise RequestError(409, "The draft is complete")
+        on_the_clock = self.draft_sequence[self.pick_number]
+        if drafter is not None and drafter != on_the_clock:
+            raise RequestError(409, f"{on_the_clock} is on the clock, not {drafter}", on_the_clock=on_the_clock)
+        if player not in self.available_players:
+            matches = [name for name, _ in self.name_index.extract(player, limit=5)]
+            raise RequestError(404, f"{player} is not available", matches=matches)
+        pick = {'pick': self.pick_number + 1, 'round': self.current_round, 'team': on_the_clock, 'player': player}
+        self.teams[on_the_clock].append(player)
+        self.available_players.remove(player)
+        self.name_index.remove(player)
+        self.draft.record_pick(player)
+        self.picks.append(pick)
+        return pick
+
+    # My suggestion lists for the current board; runs on the executor
+    def suggestions(self, num_suggestions):
+        if self.draft.future is None:
+            raise RequestError(409, "No picks left for 'me'")
+        list_a, list_b, list_c = self.draft.suggestions(self.current_round, num_suggestions, self.num_rounds)
+        return {'round': self.current_round, 'by_roto_score': list_a, 'by_z_score': list_b, 'combined': list_c,
+                'endgame': self.draft.endgame_plan()}
+
+    # Rosters, standings and who is on the clock
+    def summary(self):
+        points, scores = self.draft.standings()
+        complete = self.pick_number >= len(self.draft_sequence)
+        return {
+            'session': self.session_id,
+            'draft_order': self.team_names,
+            'pick': self.pick_number + 1,
+            'round': self.current_round,
+            'on_the_clock': None if complete else self.draft_sequence[self.pick_number],
+            'complete': complete,
+            'teams': self.teams,
+            'standings': {
+                team: {'roto_score': float(scores[i]), 'category_ranks': dict(zip(CATEGORIES, points[i].tolist()))}
+                for i, team in enumerate(self.team_names)
+            },
+            'my_stats': totals_to_stats(self.draft.team_totals[self.draft.my_index])
+        }
+
+    def close(self):
+        self.draft.close()
+
+# Class to serve draft sessions over HTTP with JSON bodies
+# Every session reads the same player store, loaded once and made read-only. Requests are
+# handled on one event loop; suggestion scoring runs on a thread pool so a slow query
+# doesn't hold up other sessions' picks.
+#   POST   /sessions                       {"draft_order": [...], "rounds": 13, "z_ranking": "pool"}
+#   GET    /sessions                       session IDs
+#   GET    /sessions/<id>                  rosters, standings and who is on the clock
+#   POST   /sessions/<id>/picks            {"player": "...", "team": "..." (optional check)}
+#   GET    /sessions/<id>/suggestions?n=10 my three suggestion lists, and my exact endgame plan late on
+#   DELETE /sessions/<id>
+class DraftServer:
+    ROUTES = [
+        ('POST', re.compile(r'^/sessions$'), 'create_session'),
+        ('GET', re.compile(r'^/sessions$'), 'list_sessions'),
+        ('GET', re.compile(r'^/sessions/(\w+)$'), 'get_session'),
+        ('DELETE', re.compile(r'^/sessions/(\w+)$'), 'delete_session'),
+        ('POST', re.compile(r'^/sessions/(\w+)/picks$'), 'post_pick'),
+        ('GET', re.compile(r'^/sessions/(\w+)/suggestions$'), 'get_suggestions'),
+    ]
+
+    def __init__(self, store, max_workers=None):
+        store.matrix.flags.writeable = False
+        if store.total_z is not None:
+            store.total_z.flags.writeable = False
+        self.store = store
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def session(self, session_id):
+        if session_id not in self.sessions:
+            raise RequestError(404, f"No session {session_id}")
+        return self.sessions[session_id]
+
+    async def create_session(self, body, query):
+        draft_order = body.get('draft_order')
+        if not isinstance(draft_order, list) or not draft_order:
+            raise RequestError(400, "draft_order must be a list of team names")
+        if not all(isinstance(name, str) and name.strip() for name in draft_order):
+            raise RequestError(400, "draft_order entries must be non-empty team names")
+        session_id = str(next(self.session_ids))
+        session = DraftSession(session_id, self.store, draft_order, int(body.get('rounds', 13)),
+                               body.get('z_ranking', 'pool'))
+        self.sessions[session_id] = session
+        return 201, session.summary()
+
+    async def list_sessions(self, body, query):
+        return 200, {'sessions': list(self.sessions)}
+
+    async def get_session(self, body, query, session_id):
+        session = self.session(session_id)
+        async with session.lock:
+            return 200, session.summary()
+
+    async def delete_session(self, body, query, session_id):
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            raise RequestError(404, f"No session {session_id}")
+        session.close()
+        return 200, {'deleted': session_id}
+
+    async def post_pick(self, body, query, session_id):
+        session = self.session(session_id)
+        player = body.get('player')
+        if not isinstance(player, str) or not player.strip():
+            raise RequestError(400, "player must be a player name")
+        async with session.lock:
+            pick = session.record_pick(player.strip(), body.get('team'))
+            return 201, {**pick, 'on_the_clock': session.summary()['on_the_clock']}
+
+    async def get_suggestions(self, body, query, session_id):
+        session = self.session(session_id)
+        num_suggestions = int(query.get('n', ['10'])[0])
+        async with session.lock:
+            loop = asyncio.get_running_loop()
+            return 200, await loop.run_in_executor(self.executor, session.suggestions, num_suggestions)
+
+    # Route one request to its handler and return the status and JSON body
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        allowed = False
+        for route_method, pattern, handler in self.ROUTES:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            allowed = True
+            if route_method == method:
+                return await getattr(self, handler)(body, parse_qs(url.query), *match.groups())
+        if allowed:
+            raise RequestError(405, f"{method} is not supported on {url.path}")
+        raise RequestError(404, f"No route for {url.path}")
+
+    # Read one HTTP/1.1 request per connection and answer it
+    async def handle_connection(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            try:
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode('latin-1').strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_SIZE:
+                    raise RequestError(413, "Request body is too large")
+                raw_body = await reader.readexactly(length) if length else b''
+                body = json.loads(raw_body) if raw_body else {}
+                if not isinstance(body, dict):
+                    raise RequestError(400, "Request body must be a JSON object")
+                status, payload = await self.dispatch(method.upper(), target, body)
+            except RequestError as error:
+                status, payload = error.status, error.body
+            except (ValueError, asyncio.IncompleteReadError) as error:
+                status, payload = 400, {'error': str(error)}
+            except Exception as error:  # Keep serving other sessions after a handler bug
+                status, payload = 500, {'error': repr(error)}
+            data = json.dumps(payload).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + data
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Draft advisor serving {len(self.store)} players on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
+        self.executor.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve live draft sessions over one preloaded player pool.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on')
+    parser.add_argument('--csv', default=DEFAULT_CSV, help='Player CSV to load')
+    parser.add_argument('--workers', type=int, help='Threads scoring suggestions (default: Python\'s choice)')
+    args = parser.parse_args()
+
+    # Load the player store once; every session shares it
+    server = DraftServer(load_player_store(args.csv), args.workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
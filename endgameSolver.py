@@ -0,0 +1,299 @@
+import argparse
+import time
+import numpy as np
+from playerStore import STAT_INDEX, STAT_COLUMNS, PlayerStore, AvailabilityIndex
+from rotoStandings import CATEGORIES, totals_to_categories, rank_roto_standings
+from playerData import load_player_store
+
+# Solve exactly once no more than this many of my picks remain. With three picks left on
+# the shipped pool a solve takes about 1 s: the bound prunes little that shallow, so nearly
+# every draftable set is scored. Each extra pick multiplies the work by the pool size, and
+# LiveDraft runs the solve in the background before my turn.
+ENDGAME_PICKS = 3
+
+# My last picks scored together for every combination rather than searched pick by pick
+COMPLETION_PICKS = 2
+
+# Stats where a lower total is better, and the (made, attempted, category) of each percentage
+LOWER_IS_BETTER = np.isin(np.arange(len(STAT_COLUMNS)), [STAT_INDEX['TOs']])
+PERCENTAGES = [(STAT_INDEX['fgm'], STAT_INDEX['fga'], CATEGORIES.index('fg%')),
+               (STAT_INDEX['ftm'], STAT_INDEX['fta'], CATEGORIES.index('ft%'))]
+
+# Decimals league totals are rounded to before ranking. Projected stats have one or two
+# decimals, so equal totals reached by different sums must compare equal, and float error
+# from adding and subtracting prefix sums would otherwise break those category ties.
+TOTALS_DECIMALS = 6
+
+# Function to round stat totals for ranking (see TOTALS_DECIMALS)
+def settle(totals):
+    return np.round(totals, TOTALS_DECIMALS)
+
+# Function to rank leagues (..., teams, STAT_COLUMNS) and return my total roto score in each
+def roto_score(league_totals, my_index):
+    _, scores = rank_roto_standings(totals_to_categories(settle(league_totals)))
+    return scores[..., my_index]
+
+# Function to sum the n largest values along the first axis
+def largest(values, n):
+    return -np.partition(-values, n - 1, axis=0)[:n].sum(axis=0)
+
+# Class to find my best remaining picks exactly, by branch and bound
+# Opponents are projected to take the best available player in the ranking at each of their
+# turns, like LiveDraft's speculation. Under that projection opponents end up with the top
+# players I don't take, so my final roto score depends only on the set of players I take,
+# and a set can be drafted exactly when taking it in ranking order beats the opponents to
+# each player. Sets are searched in ranking order; a partial set is pruned when standings
+# built from per-category bounds (my best attainable totals against each opponent's worst
+# projected totals) can't beat the best complete set found so far.
+class EndgameSolver:
+    def __init__(self, store, team_totals, available, remaining_teams, my_index, ranking):
+        self.team_totals = np.asarray(team_totals, dtype=np.float64)
+        self.my_index = my_index
+        num_teams = len(self.team_totals)
+
+        # Available players in ranking order, and the opponents' turns in draft order
+        self.players = np.array([player_id for player_id in ranking.order if (available >> player_id) & 1], dtype=int)
+        self.stats = store.matrix[self.players]
+        opponent_turns = np.array([team for team in remaining_teams if team != my_index], dtype=int)
+        # Opponent turns before each of my picks
+        self.turns_before = []
+        for position, team in enumerate(remaining_teams):
+            if team == my_index:
+                self.turns_before.append(position - len(self.turns_before))
+        self.num_picks = min(len(self.turns_before), len(self.players))
+
+        # With k of my picks ranked above player i, the opponents' turn i - k takes player i.
+        # cumulative[k] sums those contributions per team down the ranking, so any set of my
+        # picks splits the ranking into segments that each have one shift.
+        num_players = len(self.players)
+        contributions = np.zeros((self.num_picks + 1, num_players, num_teams, len(STAT_COLUMNS)))
+        for k in range(self.num_picks + 1):
+            turns = np.arange(num_players) - k
+            taken = (turns >= 0) & (turns < len(opponent_turns))
+            contributions[k, np.flatnonzero(taken), opponent_turns[turns[taken]]] = self.stats[taken]
+        zero = np.zeros((self.num_picks + 1, 1, num_teams, len(STAT_COLUMNS)))
+        self.cumulative = np.concatenate([zero, np.cumsum(contributions, axis=1)], axis=1)
+
+        # With k of my picks made, opponent turn s takes a player from ranking positions s + k
+        # to s + num_picks. low[k][s] / high[k][s] sum, per team, the least / most of each stat
+        # those windows hold over turns s onwards.
+        padded = np.concatenate([self.stats, np.zeros((self.num_picks + len(opponent_turns) + 1, len(STAT_COLUMNS)))])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.num_picks + 1, axis=0)[:len(opponent_turns)]
+        teams = np.eye(num_teams)[opponent_turns][:, :, None]
+        self.low, self.high = [], []
+        for k in range(self.num_picks + 1):
+            for bounds, values in [(self.low, windows[..., k:].min(axis=-1)), (self.high, windows[..., k:].max(axis=-1))]:
+                per_team = np.cumsum((teams * values[:, None, :])[::-1], axis=0)[::-1]
+                bounds.append(np.concatenate([per_team, np.zeros((1, num_teams, len(STAT_COLUMNS)))]))
+        self.nodes = 0
+        self.pruned = 0
+
+    # Opponents' totals from the players ranked above start, given my picks there (ascending positions)
+    def opponent_totals_above(self, positions, start):
+        totals = self.team_totals.copy()
+        previous = 0
+        for k, position in enumerate(positions):
+            totals += self.cumulative[k, position] - self.cumulative[k, previous]
+            previous = position + 1
+        totals += self.cumulative[len(positions), start] - self.cumulative[len(positions), previous]
+        totals[self.my_index] = self.team_totals[self.my_index]
+        return totals
+
+    # Upper bound on my final roto score after these picks, with picks_left more ranked below them
+    def bound(self, positions, my_totals, picks_left):
+        start = positions[-1] + 1 if positions else 0
+        # Opponents: the players above start are settled; the turns that follow take players below it
+        above = self.opponent_totals_above(positions, start)
+        turn = min(start - len(positions), len(self.low[0]) - 1)
+        opponents_low = settle(above + self.low[len(positions)][turn])
+        opponents_high = settle(above + self.high[len(positions)][turn])
+        # Me: the picks_left best (or worst) values in each stat among the players below start
+        below = self.stats[start:]
+        if len(below) < picks_left:
+            return -np.inf  # Not enough players left for my picks
+        my_high = settle(my_totals + largest(below, picks_left) if picks_left else my_totals)
+        my_low = settle(my_totals - largest(-below, picks_left) if picks_left else my_totals)
+
+        # Optimistic league: my best totals against each opponent's worst
+        league = np.where(LOWER_IS_BETTER, opponents_high, opponents_low)
+        league[self.my_index] = np.where(LOWER_IS_BETTER, my_low, my_high)
+        values = totals_to_categories(league)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for made, attempted, category in PERCENTAGES:
+                values[:, category] = np.where(opponents_high[:, attempted] != 0,
+                                               opponents_low[:, made] / opponents_high[:, attempted] * 100, 0.0)
+                if my_low[attempted] != 0:
+                    values[self.my_index, category] = my_high[made] / my_low[attempted] * 100
+                else:
+                    values[self.my_index, category] = np.inf if my_high[made] > 0 else 0.0
+        _, scores = rank_roto_standings(values)
+        return scores[self.my_index]
+
+    # Positions at or below start where my next pick would beat the opponents to the player
+    def candidates(self, positions, start):
+        first = max(start, self.turns_before[len(positions)] + len(positions))
+        return range(first, len(self.players))
+
+    # Score every way to make my last count picks at once and return the best positions and score
+    # Ties go to the first set in ranking order, like the depth-first search.
+    def best_completion(self, positions, my_totals, start, count):
+        k = len(positions)
+        firsts = [max(start + i, self.turns_before[k + i] + k + i) for i in range(count)]
+        if count == 1:
+            picks = np.arange(firsts[0], len(self.players))[:, None]
+        else:
+            first, second = np.triu_indices(len(self.players), 1)
+            keep = (first >= firsts[0]) & (second >= firsts[1])
+            picks = np.column_stack([first[keep], second[keep]])
+        if len(picks) == 0:
+            return None, -np.inf
+        leagues = np.repeat(self.opponent_totals_above(positions, start)[None], len(picks), axis=0)
+        previous = np.full(len(picks), start)
+        for i in range(count):
+            leagues += self.cumulative[k + i, picks[:, i]] - self.cumulative[k + i, previous]
+            previous = picks[:, i] + 1
+        leagues += self.cumulative[k + count, -1] - self.cumulative[k + count, previous]
+        leagues[:, self.my_index] = my_totals + self.stats[picks].sum(axis=1)
+        scores = roto_score(leagues, self.my_index)
+        best = int(np.argmax(scores))
+        self.nodes += len(picks)
+        return picks[best].tolist(), scores[best]
+
+    # Search every draftable set of my remaining picks
+    # Returns the player IDs in the order to take them (ranking order), my projected roto score
+    # and the search's node and pruning counts.
+    def solve(self):
+        self.nodes = self.pruned = 0
+        best_positions, best_score = [], -np.inf
+        my_totals = self.team_totals[self.my_index]
+        if self.num_picks == 0:
+            # Opponents take the top of the ranking with every turn they have left
+            league = self.team_totals + self.cumulative[0, -1]
+            return {'plan': [], 'roto_score': float(roto_score(league, self.my_index)), 'nodes': 0, 'pruned': 0}
+
+        # Depth-first over positions in ranking order: (positions, my totals, bound) per frame.
+        # The last picks are scored all at once instead of branched on.
+        completion = min(COMPLETION_PICKS, self.num_picks)
+        stack = [([], my_totals, np.inf)]
+        while stack:
+            positions, totals, bound = stack.pop()
+            if bound <= best_score:
+                self.pruned += 1  # A better set was found since this frame was bounded
+                continue
+            start = positions[-1] + 1 if positions else 0
+            if len(positions) == self.num_picks - completion:
+                picks, score = self.best_completion(positions, totals, start, completion)
+                if score > best_score:
+                    best_positions, best_score = positions + picks, score
+                continue
+            children = []
+            for position in self.candidates(positions, start):
+                self.nodes += 1
+                child = positions + [position]
+                child_totals = totals + self.stats[position]
+                bound = self.bound(child, child_totals, self.num_picks - len(child))
+                if bound <= best_score:
+                    self.pruned += 1
+                    continue
+                children.append((child, child_totals, bound))
+            stack.extend(reversed(children))  # Explore higher-ranked players first
+        return {
+            'plan': self.players[best_positions].tolist(),
+            'roto_score': float(best_score) if best_positions else None,  # None when no set can be drafted
+            'nodes': self.nodes,
+            'pruned': self.pruned
+        }
+
+# Function to solve my last picks exactly from a live draft's state
+def solve_endgame(store, team_totals, available, remaining_teams, my_index, ranking):
+    return EndgameSolver(store, team_totals, available, remaining_teams, my_index, ranking).solve()
+
+# Function to find my best remaining picks by trying every pick at every one of my turns
+# Opponents take the best available player in the ranking, as in the solver; totals are
+# summed player by player. Only feasible on small pools; used to check the solver.
+def brute_force_endgame(store, team_totals, available, remaining_teams, my_index, ranking):
+    best_plan, best_score = [], -np.inf
+
+    def search(turn, available, totals, plan):
+        nonlocal best_plan, best_score
+        while turn < len(remaining_teams) and remaining_teams[turn] != my_index:
+            top = ranking.top_available(available, 1)
+            if top:
+                totals = totals.copy()
+                totals[remaining_teams[turn]] += store.matrix[top[0]]
+                available &= ~(1 << top[0])
+            turn += 1
+        if turn == len(remaining_teams) or not ranking.top_available(available, 1):
+            score = roto_score(totals, my_index)
+            if score > best_score:
+                best_plan, best_score = plan, score
+            return
+        for player_id in ranking.top_available(available, len(ranking)):
+            totals_after = totals.copy()
+            totals_after[my_index] += store.matrix[player_id]
+            search(turn + 1, available & ~(1 << player_id), totals_after, plan + [player_id])
+
+    search(0, available, np.asarray(team_totals, dtype=np.float64), [])
+    return {'plan': best_plan, 'roto_score': float(best_score)}
+
+# Function to play out a plan of my picks against greedy opponents and return my roto score
+# At each of my turns I take the first planned player still available.
+def play_plan(store, team_totals, available, remaining_teams, my_index, ranking, plan):
+    totals = np.array(team_totals, dtype=np.float64)
+    for team in remaining_teams:
+        if team == my_index:
+            player_id = next((player_id for player_id in plan if (available >> player_id) & 1), None)
+        else:
+            top = ranking.top_available(available, 1)
+            player_id = top[0] if top else None
+        if player_id is None:
+            continue
+        totals[team] += store.matrix[player_id]
+        available &= ~(1 << player_id)
+    return float(roto_score(totals, my_index))
+
+# Function to check the solver against brute force on random small leagues from a store
+# Each trial drafts a few random rounds into a league of 3 to 5 teams, then compares the
+# solver's plan (played out, and as reported) with the best plan found by brute force.
+# Returns the trials that disagree.
+def check_against_brute_force(store, trials=30, pool_size=14, seed=0):
+    rng = np.random.default_rng(seed)
+    failures = []
+    for trial in range(trials):
+        num_teams = int(rng.integers(3, 6))
+        ids = rng.choice(len(store), size=pool_size + 2 * num_teams, replace=False)
+        small = PlayerStore([store.names[i] for i in ids], store.matrix[ids], rng.permutation(len(ids)).astype(float))
+        ranking = AvailabilityIndex(small.total_z)
+        # Earlier rounds: every team holds two random players outside the pool
+        team_totals = small.matrix[:2 * num_teams].reshape(num_teams, 2, -1).sum(axis=1)
+        available = sum(1 << player_id for player_id in range(2 * num_teams, len(small)))
+        snake = list(range(num_teams)) + list(range(num_teams - 1, -1, -1))
+        remaining = (snake * 2)[int(rng.integers(0, num_teams)):][:min(3 * num_teams, pool_size)]
+        my_index = int(rng.integers(num_teams))
+        args = (small, team_totals, available, remaining, my_index, ranking)
+
+        solved = solve_endgame(*args)
+        expected = brute_force_endgame(*args)
+        played = play_plan(*args, solved['plan'])
+        if played != expected['roto_score'] or solved['roto_score'] != played:
+            failures.append({'trial': trial, 'solver': solved['roto_score'], 'played': played,
+                             'brute_force': expected['roto_score']})
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the endgame solver against brute force on small leagues.')
+    parser.add_argument('--csv', default='players_with_estimates.csv', help='Player CSV to draw the leagues from')
+    parser.add_argument('--trials', type=int, default=30, help='Random leagues to check')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the random leagues')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    failures = check_against_brute_force(load_player_store(args.csv), args.trials, seed=args.seed)
+    for failure in failures:
+        print(f"Trial {failure['trial']}: solver reported {failure['solver']}, its plan scores {failure['played']}, "
+              f"brute force found {failure['brute_force']}")
+    print(f"{args.trials - len(failures)}/{args.trials} trials matched brute force "
+          f"({time.perf_counter() - start:.1f}s)")
+
+if __name__ == "__main__":
+    main()
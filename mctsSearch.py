@@ -0,0 +1,271 @@
+import argparse
+import math
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import constantDraftSnaker
+from constantDraftSnaker import (OPPONENT_PICK_PROBS, DraftState, zobrist_table, anytime_beam_search,
+                                 init_simulation_worker)
+from playerStore import STAT_COLUMNS, AvailabilityIndex, share_player_store
+from rotoStandings import totals_to_categories, rank_roto_standings
+from opponentRollouts import rollout_log_weights, rollout_roto_scores
+from playerData import load_player_store
+
+# UCB exploration constant, for values scaled to [0, 1] by the best possible roto score
+EXPLORATION = 0.5
+
+# Number of rounds in the draft, as in the beam search
+NUM_ROUNDS = 13
+
+# Function to build the snake draft for one draft position
+# Returns the team names in pick order (ours is 'OurTeam') and the team index of every pick.
+def snake_draft(num_teams, draft_position, num_rounds=NUM_ROUNDS):
+    draft_order = ['Team' + str(i+1) for i in range(num_teams)]
+    draft_order[draft_position - 1] = 'OurTeam'
+    sequence = []
+    for round_number in range(1, num_rounds + 1):
+        teams = range(num_teams) if round_number % 2 != 0 else range(num_teams - 1, -1, -1)
+        sequence.extend(teams)
+    return draft_order, np.array(sequence)
+
+# Function to sample an opponent's pick from their top available players
+def sample_opponent_pick(top_players, rng=np.random):
+    probs = np.array(OPPONENT_PICK_PROBS[:len(top_players)] + [0] * (len(top_players) - len(OPPONENT_PICK_PROBS)))
+    return top_players[rng.choice(len(top_players), p=probs / probs.sum())]
+
+# Class for one of our pick decisions in the search tree
+# The tree is open loop: opponents' picks are resampled on every pass, so a node stands for
+# our sequence of picks so far and its children for our next pick.
+class SearchNode:
+    __slots__ = ['children', 'visits', 'total']
+
+    def __init__(self):
+        self.children = {}  # Player ID -> SearchNode
+        self.visits = 0
+        self.total = 0.0  # Sum of the rollout values backed up through this node
+
+    # Choose among the candidates available on this pass: an untried one first, else by UCB
+    # Returns the player, the child node and whether the child was just added.
+    def select(self, candidates, exploration):
+        for player_id in candidates:
+            if player_id not in self.children:
+                child = self.children[player_id] = SearchNode()
+                return player_id, child, True
+        log_visits = math.log(self.visits)
+        best = max(candidates, key=lambda player_id: self.children[player_id].ucb(log_visits, exploration))
+        return best, self.children[best], False
+
+    def ucb(self, log_visits, exploration):
+        return self.total / self.visits + exploration * math.sqrt(log_visits / self.visits)
+
+# Function to run Monte Carlo tree search over our picks for one draft position
+# Each pass walks the draft from the first pick: opponents pick like in the beam search
+# (sampled from their top_n by opponent_index), we pick by UCB among our top_n available
+# players by total_z, and the first pick not yet in the tree is added. The rest of the draft
+# is then played out with one fast Plackett-Luce rollout (see opponentRollouts) and our final
+# roto score, over the best possible score, is backed up the path.
+# Stops after iterations passes or time_budget seconds, whichever comes first.
+def mcts_search(store, draft_position, num_teams=10, top_n=10, iterations=None, time_budget=None,
+                exploration=EXPLORATION, rollout_decay=0.6, opponent_index=None):
+    if iterations is None and time_budget is None:
+        raise ValueError("mcts_search needs iterations or a time_budget")
+    draft_order, sequence = snake_draft(num_teams, draft_position)
+    our_index = draft_order.index('OurTeam')
+    z_index = AvailabilityIndex(store.total_z)
+    if opponent_index is None:
+        opponent_index = z_index
+    log_weights = rollout_log_weights(opponent_index, len(store), rollout_decay)
+    max_score = 9 * num_teams
+    root_state = DraftState(
+        round_number=1,
+        pick_order=draft_order,
+        available=(1 << len(store)) - 1,
+        team_totals=np.zeros((num_teams, len(STAT_COLUMNS))),
+        names=store.names,
+        zobrist=zobrist_table(num_teams, len(store))
+    )
+    root = SearchNode()
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    while (iterations is None or root.visits < iterations) and (deadline is None or time.perf_counter() < deadline):
+        # Selection and expansion, with opponents sampled along the way
+        state, node, path = root_state, root, [root]
+        pick_index = 0
+        expanded = False
+        while pick_index < len(sequence) and not expanded:
+            team_index = int(sequence[pick_index])
+            ranking = z_index if team_index == our_index else opponent_index
+            top_players = state.top_available(ranking, top_n)
+            if not top_players:
+                break  # Pool exhausted
+            if team_index == our_index:
+                player_id, node, expanded = node.select(top_players, exploration)
+                path.append(node)
+            else:
+                player_id = sample_opponent_pick(top_players)
+            state = state.child(pick_index // num_teams + 1, team_index, player_id, store)
+            pick_index += 1
+
+        # Rollout and backup
+        value = float(rollout_roto_scores(store, log_weights, [state.available], state.team_totals[None],
+                                          sequence[pick_index:], our_index, 1)[0, 0]) / max_score
+        for visited in path:
+            visited.visits += 1
+            visited.total += value
+    return root
+
+# Function to flatten a tree into {pick path: (visits, total value)} for merging across workers
+def tree_statistics(root):
+    stats = {}
+    stack = [((), root)]
+    while stack:
+        path, node = stack.pop()
+        stats[path] = (node.visits, node.total)
+        for player_id, child in node.children.items():
+            stack.append((path + (player_id,), child))
+    return stats
+
+# Function to sum the statistics of several trees
+def merge_statistics(all_stats):
+    merged = {}
+    for stats in all_stats:
+        for path, (visits, total) in stats.items():
+            merged_visits, merged_total = merged.get(path, (0, 0.0))
+            merged[path] = (merged_visits + visits, merged_total + total)
+    return merged
+
+# Function to follow the most visited child from the root, giving our planned picks in order
+def principal_variation(stats):
+    children = {}
+    for path in stats:
+        if path:
+            children.setdefault(path[:-1], []).append(path)
+    plan = ()
+    while plan in children:
+        plan = max(children[plan], key=lambda path: (stats[path][0], stats[path][1]))
+    return list(plan)
+
+# Function to run the search for one draft position inside a worker process
+def mcts_for_position(position, num_teams, top_n, iterations, time_budget, seed=None, exploration=EXPLORATION):
+    if seed is not None:
+        np.random.seed(seed)
+    root = mcts_search(constantDraftSnaker.worker_store, position, num_teams, top_n, iterations, time_budget,
+                       exploration)
+    return tree_statistics(root)
+
+# Function to run root-parallel MCTS: independent trees in worker processes, merged by pick path
+# Workers attach to a shared-memory copy of the store like run_simulations. iterations and
+# time_budget apply to each worker. Returns our planned picks (most visited path), the
+# root statistics of our first pick and the total number of passes.
+def run_mcts(store, draft_position, num_teams=10, top_n=10, iterations=None, time_budget=None, workers=None,
+             seed=None, exploration=EXPLORATION):
+    workers = workers or os.cpu_count()
+    shm, descriptor = share_player_store(store)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_simulation_worker,
+                                 initargs=(descriptor,)) as executor:
+            futures = [
+                executor.submit(mcts_for_position, draft_position, num_teams, top_n, iterations, time_budget,
+                                None if seed is None else seed + worker, exploration)
+                for worker in range(workers)
+            ]
+            stats = merge_statistics(future.result() for future in futures)
+    finally:
+        shm.close()
+        shm.unlink()
+    first_picks = sorted((path for path in stats if len(path) == 1), key=lambda path: -stats[path][0])
+    return {
+        'plan': principal_variation(stats),
+        'first_picks': [{
+            'player': store.names[path[0]],
+            'visits': stats[path][0],
+            'mean_score': stats[path][1] / stats[path][0] * 9 * num_teams
+        } for path in first_picks],
+        'iterations': stats[()][0],
+        'workers': workers
+    }
+
+# Function to score a plan of our picks over simulated drafts
+# At each of our turns we take the first planned player still available (the best total_z
+# player once the plan runs out); opponents pick like in the beam search. Evaluation e
+# draws from a generator seeded with (seed, e), so plans compared with the same seed face
+# the same random streams. Returns our final roto score in each draft.
+def evaluate_plan(store, draft_position, plan, num_teams=10, top_n=10, evaluations=200, seed=0):
+    draft_order, sequence = snake_draft(num_teams, draft_position)
+    our_index = draft_order.index('OurTeam')
+    z_index = AvailabilityIndex(store.total_z)
+    scores = np.empty(evaluations)
+    for evaluation in range(evaluations):
+        rng = np.random.default_rng([seed, evaluation])
+        available = (1 << len(store)) - 1
+        team_totals = np.zeros((num_teams, len(STAT_COLUMNS)))
+        for team_index in sequence.tolist():
+            if team_index == our_index:
+                player_id = next((player_id for player_id in plan if (available >> player_id) & 1), None)
+                if player_id is None:
+                    top_players = z_index.top_available(available, 1)
+                    player_id = top_players[0] if top_players else None
+            else:
+                top_players = z_index.top_available(available, top_n)
+                player_id = sample_opponent_pick(top_players, rng) if top_players else None
+            if player_id is None:
+                continue
+            team_totals[team_index] += store.matrix[player_id]
+            available &= ~(1 << player_id)
+        _, total_scores = rank_roto_standings(totals_to_categories(team_totals))
+        scores[evaluation] = total_scores[our_index]
+    return scores
+
+# Function to compare MCTS with the anytime beam search at the same compute budget
+# The beam search gets time_budget seconds in one process; MCTS splits the same CPU time
+# across its workers. Each engine's plan is then scored on the same simulated drafts.
+def compare_engines(store, draft_position, time_budget, num_teams=10, top_n=10, workers=None, evaluations=200, seed=0):
+    workers = workers or os.cpu_count()
+    start = time.perf_counter()
+    best_teams, report = anytime_beam_search(store, draft_position, time_budget, num_teams, top_n, seed=seed)
+    best = max(best_teams, key=lambda state: state.total_roto_score)
+    beam_plan = best.roster_ids(best.our_index)
+    beam_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mcts = run_mcts(store, draft_position, num_teams, top_n, time_budget=time_budget / workers, workers=workers,
+                    seed=seed)
+    mcts_time = time.perf_counter() - start
+
+    results = {}
+    for engine, plan, elapsed, details in [
+        ('beam', beam_plan, beam_time, {'beam_width': report['beam_width']}),
+        ('mcts', mcts['plan'], mcts_time, {'iterations': mcts['iterations'], 'workers': workers})
+    ]:
+        scores = evaluate_plan(store, draft_position, plan, num_teams, top_n, evaluations, seed)
+        results[engine] = {
+            'plan': [store.names[player_id] for player_id in plan],
+            'mean_score': float(scores.mean()),
+            'std_error': float(scores.std(ddof=1) / np.sqrt(len(scores))),
+            'elapsed': elapsed,
+            **details
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Monte Carlo tree search with the beam search.')
+    parser.add_argument('--position', type=int, default=1, help='Our draft position')
+    parser.add_argument('--teams', type=int, default=10, help='Number of teams')
+    parser.add_argument('--budget', type=float, default=10.0, help='CPU seconds each engine gets')
+    parser.add_argument('--workers', type=int, help='MCTS worker processes (default: one per CPU)')
+    parser.add_argument('--evaluations', type=int, default=200, help='Simulated drafts each plan is scored on')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the searches and the evaluation drafts')
+    args = parser.parse_args()
+
+    store = load_player_store('players_with_estimates.csv')
+    results = compare_engines(store, args.position, args.budget, args.teams, workers=args.workers,
+                              evaluations=args.evaluations, seed=args.seed)
+    for engine, result in results.items():
+        extra = ', '.join(f"{key}: {result[key]}" for key in ['beam_width', 'iterations', 'workers'] if key in result)
+        print(f"{engine}: mean roto score {result['mean_score']:.2f} ± {result['std_error']:.2f} "
+              f"over {args.evaluations} drafts ({result['elapsed']:.1f}s; {extra})")
+        print(f"  plan: {', '.join(result['plan'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import heapq
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+# Common nicknames and short forms, mapped to the player names they stand for
+# Aliases for players not in the pool are ignored.
+NICKNAMES = {
+    'wemby': 'Victor Wembanyama',
+    'joker': 'Nikola Jokic',
+    'sga': 'Shai Gilgeous-Alexander',
+    'shai': 'Shai Gilgeous-Alexander',
+    'hali': 'Tyrese Haliburton',
+    'ad': 'Anthony Davis',
+    'the brow': 'Anthony Davis',
+    'spida': 'Donovan Mitchell',
+    'ant': 'Anthony Edwards',
+    'ant man': 'Anthony Edwards',
+    'ice trae': 'Trae Young',
+    'greek freak': 'Giannis Antetokounmpo',
+    'giannis': 'Giannis Antetokounmpo',
+    'melo ball': 'LaMelo Ball',
+    'sabonis': 'Domantas Sabonis',
+    'steph': 'Stephen Curry',
+    'chef curry': 'Stephen Curry',
+    'kat': 'Karl-Anthony Towns',
+    'the beard': 'James Harden',
+    'bron': 'LeBron James',
+    'king james': 'LeBron James',
+    'kd': 'Kevin Durant',
+    'slim reaper': 'Kevin Durant',
+    'dame': 'Damian Lillard',
+    'jjj': 'Jaren Jackson Jr.',
+    'pg13': 'Paul George',
+    'kawhi': 'Kawhi Leonard',
+    'the klaw': 'Kawhi Leonard',
+    'bam': 'Bam Adebayo',
+    'dlo': "D'Angelo Russell",
+    'cj': 'CJ McCollum',
+    'iq': 'Immanuel Quickley',
+    'jimmy buckets': 'Jimmy Butler',
+    'zo': 'Lonzo Ball',
+    'cp3': 'Chris Paul',
+    'klay': 'Klay Thompson',
+    'dray': 'Draymond Green',
+    'og': 'OG Anunoby',
+    'kp': 'Kristaps Porzingis',
+    'unicorn': 'Kristaps Porzingis',
+    'mpj': 'Michael Porter Jr.',
+    'pj': 'P.J. Washington',
+    'zion': 'Zion Williamson'
+}
+
+# Function to fold a name for matching: strip accents and punctuation, lowercase, single spaces
+def fold_name(name):
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    name = re.sub(r"['.]", '', name.lower())
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name).split())
+
+# Function to split a folded name into padded character trigrams
+def trigrams(folded):
+    padded = f'  {folded} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Class to look up player names by approximate spelling, built once from the player pool
+# Every name and nickname is folded and indexed by its character trigrams. A lookup scores
+# only the entries sharing a trigram with the query, and players are removed as they are
+# drafted, so lookups rarely scan the whole pool. Matches come back as (name, score) pairs
+# with scores from 0 to 100, like fuzzywuzzy's process.extract, and there are always limit of
+# them while the pool has that many players.
+class NameIndex:
+    def __init__(self, names, nicknames=NICKNAMES):
+        self.entries = []  # Entry ID -> (folded text, trigram set, player name)
+        self.player_entries = defaultdict(list)  # Player name -> entry IDs
+        self.postings = defaultdict(set)  # Trigram -> entry IDs
+        self.exact = defaultdict(set)  # Folded text -> player names
+        self.names = set()
+        for name in names:
+            self.add(name)
+        for alias, name in nicknames.items():
+            if name in self.names:
+                self.add_entry(alias, name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def add(self, name):
+        if name in self.names:
+            return
+        self.names.add(name)
+        self.add_entry(name, name)
+
+    def add_entry(self, text, name):
+        folded = fold_name(text)
+        grams = trigrams(folded)
+        entry_id = len(self.entries)
+        self.entries.append((folded, grams, name))
+        self.player_entries[name].append(entry_id)
+        self.exact[folded].add(name)
+        for gram in grams:
+            self.postings[gram].add(entry_id)
+
+    # Drop a drafted player and their nicknames from the index
+    def remove(self, name):
+        if name not in self.names:
+            return
+        self.names.discard(name)
+        for entry_id in self.player_entries.pop(name):
+            folded, grams, _ = self.entries[entry_id]
+            self.exact[folded].discard(name)
+            for gram in grams:
+                self.postings[gram].discard(entry_id)
+
+    # Best matching player names for a query, as (name, score) pairs
+    def extract(self, query, limit=5):
+        folded = fold_name(query)
+        query_grams = trigrams(folded)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for entry_id in self.postings.get(gram, ()):
+                shared[entry_id] += 1
+
+        # Dice overlap, or query containment for partial names like a surname alone
+        best = {}
+        for entry_id, count in shared.items():
+            _, grams, name = self.entries[entry_id]
+            dice = 2 * count / (len(query_grams) + len(grams))
+            containment = 0.9 * count / len(query_grams)
+            score = max(dice, containment)
+            if score > best.get(name, 0):
+                best[name] = score
+        for name in self.exact.get(folded, ()):
+            best[name] = 1.0
+
+        ranked = heapq.nsmallest(limit, best.items(), key=lambda item: (-item[1], item[0]))
+        matches = [(name, int(round(score * 100))) for name, score in ranked]
+        if len(matches) < limit:
+            # Too few names share a trigram (an empty, one-letter or garbled query):
+            # fill up with the rest of the pool ranked by edit similarity
+            rest = [(name, SequenceMatcher(None, folded, fold_name(name)).ratio())
+                    for name in self.names if name not in best]
+            filled = heapq.nsmallest(limit - len(matches), rest, key=lambda item: (-item[1], item[0]))
+            matches += [(name, int(round(score * 100))) for name, score in filled]
+        return matches
@@ -0,0 +1,62 @@
+import numpy as np
+from playerStore import availability_mask
+from rotoStandings import totals_to_categories, rank_roto_standings
+
+# Percentiles reported for rollout roto scores
+ROLLOUT_PERCENTILES = [10, 50, 90]
+
+# Upper bound on array elements per (state, rollout) chunk, to cap memory on large pools
+MAX_CHUNK_ELEMENTS = 2000000
+
+# Function to build per-player log-weights for the rollout pick model
+# Every drafter picks under a Plackett-Luce model whose weight decays geometrically with
+# the player's position in the index ordering. Geometric weights are shift invariant, so
+# each pick still favours the best few players left, like the 0.5/0.3/0.15/0.05 opponent
+# model, and a whole pick sequence is one Gumbel-top-k draw.
+def rollout_log_weights(index, num_players, decay=0.6):
+    log_weights = np.full(num_players, -np.inf)
+    log_weights[index.order] = np.arange(len(index.order)) * np.log(decay)
+    return log_weights
+
+# Function to sample the rest of the draft num_rollouts times for each state and score it
+# availables are per-state bitmasks, team_totals is (states, teams, STAT_COLUMNS) and
+# remaining_teams lists the team index for each remaining pick, in draft order.
+# Returns our final roto score for every (state, rollout).
+def rollout_roto_scores(store, log_weights, availables, team_totals, remaining_teams, our_index, num_rollouts):
+    num_states, num_teams = team_totals.shape[:2]
+    masks = np.array([availability_mask(available, len(store)) for available in availables]).reshape(num_states, -1)
+    num_picks = min(len(remaining_teams), int(masks.sum(axis=1).min()) if num_states else 0)
+    if num_picks == 0:
+        _, scores = rank_roto_standings(totals_to_categories(team_totals))
+        return np.repeat(scores[:, our_index, None], num_rollouts, axis=1)
+
+    # Remaining pick slots held by each team
+    team_slots = [np.flatnonzero(remaining_teams[:num_picks] == team) for team in range(num_teams)]
+    log_weights = np.where(masks, log_weights[None, :], -np.inf)
+
+    scores = np.empty((num_states, num_rollouts))
+    chunk = max(1, MAX_CHUNK_ELEMENTS // (num_rollouts * max(log_weights.shape[1], num_picks * store.matrix.shape[1])))
+    for start in range(0, num_states, chunk):
+        stop = min(start + chunk, num_states)
+        # Gumbel-top-k: the num_picks largest perturbed keys, in order, are one sampled pick sequence
+        keys = log_weights[start:stop, None, :] + np.random.gumbel(size=(stop - start, num_rollouts, log_weights.shape[1]))
+        top = np.argpartition(-keys, num_picks - 1, axis=-1)[..., :num_picks]
+        top_keys = np.take_along_axis(keys, top, axis=-1)
+        picks = np.take_along_axis(top, np.argsort(-top_keys, axis=-1), axis=-1)
+        # Add every sampled pick's stats to the team holding that slot
+        league = np.repeat(team_totals[start:stop, None, :, :], num_rollouts, axis=1)
+        for team, slots in enumerate(team_slots):
+            if len(slots):
+                league[:, :, team] += store.matrix[picks[..., slots]].sum(axis=-2)
+        _, totals = rank_roto_standings(totals_to_categories(league))
+        scores[start:stop] = totals[..., our_index]
+    return scores
+
+# Function to summarize rollout scores into mean, variance and percentiles per state
+def summarize_rollouts(scores):
+    percentiles = np.percentile(scores, ROLLOUT_PERCENTILES, axis=-1)
+    return [{
+        'mean': float(scores[i].mean()),
+        'variance': float(scores[i].var()),
+        'percentiles': {p: float(percentiles[j, i]) for j, p in enumerate(ROLLOUT_PERCENTILES)}
+    } for i in range(scores.shape[0])]
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from playerStore import STAT_COLUMNS, PlayerStore, build_player_store
+from statJournal import journal_path, read_journal, apply_edits
+from statValidation import find_violations
+
+# Source CSV and the directory its compiled form is cached in, next to the CSV by default
+DEFAULT_CSV = 'players_with_estimates.csv'
+CACHE_DIR_NAME = '.player_cache'
+
+# Bump when the compiled layout or the way it is derived changes, so old caches are rebuilt
+CACHE_VERSION = 3
+
+# Columns coerced to numbers when the CSV is read
+NUMERIC_COLUMNS = ['gp', 'min', 'fgp', 'ftp', '3pm', 'reb', 'ass', 'stl', 'bl', 'TOs', 'ppg',
+                   'ftm', 'fta', 'fgm', 'fga']
+
+# Categories summed into each player's total z-score
+Z_CATEGORIES = ['ppg', 'reb', 'ass', 'stl', 'bl', '3pm', 'fg%', 'ft%', 'TOs']
+
+# Function to z-score one stat column, skipping NaN like pandas' mean() and std()
+def z_score_column(values):
+    mean = np.nanmean(values)
+    std = np.nanstd(values, ddof=1)
+    if std == 0:
+        return np.zeros(len(values))
+    return (values - mean) / std
+
+# Function to sum per-category z-scores into a total per player
+# columns maps each category to its values. Counting stats come first and the percentages
+# last, turnovers count against a player, and a NaN z-score adds nothing to the total.
+def total_z_scores(columns, categories):
+    ordered = [cat for cat in categories if cat not in ['fg%', 'ft%']] + ['fg%', 'ft%']
+    z_scores = np.array([z_score_column(np.asarray(columns[cat], dtype=np.float64)) for cat in ordered])
+    if 'TOs' in ordered:
+        z_scores[ordered.index('TOs')] *= -1  # Since fewer turnovers are better
+    # Add in the same order as pandas' sum(axis=1): category by category, or row-wise over a
+    # players x categories copy when NaNs are present, so totals match it bit for bit
+    nan = np.isnan(z_scores)
+    if not nan.any():
+        return z_scores.sum(axis=0)
+    return np.ascontiguousarray(np.where(nan, 0, z_scores).T).sum(axis=1)
+
+# Function to calculate z-scores for players
+def calculate_z_scores(df, categories):
+    columns = {cat: df[cat].to_numpy(dtype=np.float64) for cat in set(categories) | {'fg%', 'ft%'}}
+    df['total_z'] = total_z_scores(columns, categories)
+    return df
+
+# Function to read the player CSV into a typed DataFrame with percentages and z-scores
+# With quarantine on, rows failing the stat consistency checks are dropped before z-scores
+# are computed. Returns the frame and the violations table (see statValidation).
+def read_player_frame(csv_path=DEFAULT_CSV, tolerances=None, quarantine=True):
+    import pandas as pd  # Only needed when the cache is cold
+    from statValidation import validate_stats, quarantine_rows
+    df = pd.read_csv(csv_path)
+    # Ensure numerical columns are correctly typed
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    if quarantine:
+        df, violations = quarantine_rows(df, tolerances)
+    else:
+        violations = validate_stats(df, tolerances)
+    # Calculate percentages
+    df['fg%'] = (df['fgm'] / df['fga']) * 100
+    df['ft%'] = (df['ftm'] / df['fta']) * 100
+    return calculate_z_scores(df, Z_CATEGORIES), violations
+
+# Function to hash a file's contents
+def file_digest(path, settings=None):
+    digest = hashlib.sha256()
+    if settings is not None:
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Function to write a store's arrays, name table and violations table into a cache directory
+# raw holds every NUMERIC_COLUMNS value per player, which stat edits are applied to.
+def write_compiled_store(store, raw, violations, path):
+    np.save(os.path.join(path, 'matrix.npy'), store.matrix)
+    np.save(os.path.join(path, 'raw.npy'), raw)
+    np.save(os.path.join(path, 'total_z.npy'), store.total_z)
+    with open(os.path.join(path, 'names.json'), 'w') as f:
+        json.dump(store.names, f)
+    violations.to_csv(os.path.join(path, 'violations.csv'), index=False)
+
+# Function to open a compiled store, with its arrays memory-mapped read-only
+def read_compiled_store(path):
+    with open(os.path.join(path, 'names.json')) as f:
+        names = json.load(f)
+    matrix = np.load(os.path.join(path, 'matrix.npy'), mmap_mode='r')
+    total_z = np.load(os.path.join(path, 'total_z.npy'), mmap_mode='r')
+    return PlayerStore(names, matrix, total_z)
+
+# Function to apply journaled stat edits on top of a compiled store
+# Only the edited players' rows are re-estimated, re-checked and rebuilt; with quarantine on,
+# edited players that now fail a stat check are left out, as a recompile would. z-scores are
+# then recomputed from the stat matrix, since every player's z-score depends on the whole pool.
+def apply_journal(store, path, edits, tolerances=None, quarantine=True):
+    raw = np.load(os.path.join(path, 'raw.npy'))
+    rows = apply_edits(raw, NUMERIC_COLUMNS, store.name_to_id, edits)
+    if not rows:
+        return store
+    names = store.names
+    matrix = np.array(store.matrix)
+    matrix[rows] = raw[np.ix_(rows, [NUMERIC_COLUMNS.index(col) for col in STAT_COLUMNS])]
+    if quarantine:
+        edited = {col: raw[rows, i] for i, col in enumerate(NUMERIC_COLUMNS)}
+        failed = np.unique(find_violations(edited, len(rows), tolerances)[0])
+        if len(failed):
+            dropped = {rows[i] for i in failed.tolist()}
+            print(f"Left out {len(dropped)} edited players that fail stat checks: "
+                  f"{', '.join(names[row] for row in sorted(dropped))}.")
+            keep = np.array([row not in dropped for row in range(len(names))])
+            names = [name for name, kept in zip(names, keep) if kept]
+            matrix = matrix[keep]
+    columns = {stat: matrix[:, i] for i, stat in enumerate(STAT_COLUMNS)}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        columns['fg%'] = (columns['fgm'] / columns['fga']) * 100
+        columns['ft%'] = (columns['ftm'] / columns['fta']) * 100
+    return PlayerStore(names, matrix, total_z_scores(columns, Z_CATEGORIES))
+
+# Function to compile the CSV into the cache directory for key
+# Compiles into a temporary directory and renames it into place, so readers never see a
+# partial cache, then removes caches for earlier versions of the CSV.
+def compile_player_store(csv_path, cache_dir, key, tolerances=None, quarantine=True):
+    path = os.path.join(cache_dir, key)
+    df, violations = read_player_frame(csv_path, tolerances, quarantine)
+    store = build_player_store(df)
+    if quarantine and len(violations):
+        print(f"Quarantined {violations['row'].nunique()} players that failed stat checks "
+              f"(listed in {os.path.join(path, 'violations.csv')}).")
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = tempfile.mkdtemp(dir=cache_dir, prefix='.compiling-')
+    try:
+        write_compiled_store(store, df[NUMERIC_COLUMNS].to_numpy(dtype=np.float64), violations, temp_path)
+        os.rename(temp_path, path)
+    except OSError:
+        shutil.rmtree(temp_path, ignore_errors=True)  # Another process compiled it first
+        if not os.path.isdir(path):
+            raise
+    for name in os.listdir(cache_dir):
+        if name != key and not name.startswith('.'):
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+
+# Function to load the player store, compiling the CSV into a cached binary form on first use
+# The cache is keyed by a hash of the CSV's contents and the validation settings, so editing
+# the CSV triggers a rebuild and warm starts skip CSV parsing, validation, z-scores and the
+# pandas import entirely. Rows quarantined by the stat checks are listed in the cache's
+# violations.csv. Edits in the CSV's journal (see changeStats.py) are applied on top of the
+# cached store, so they take effect without recompiling.
+def load_player_store(csv_path=DEFAULT_CSV, cache_dir=None, tolerances=None, quarantine=True):
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    settings = {'tolerances': tolerances, 'quarantine': quarantine}
+    key = f"v{CACHE_VERSION}-{file_digest(csv_path, settings)}"
+    path = os.path.join(cache_dir, key)
+    if not os.path.isdir(path):
+        compile_player_store(csv_path, cache_dir, key, tolerances, quarantine)
+    store = read_compiled_store(path)
+    edits = read_journal(journal_path(csv_path))
+    return apply_journal(store, path, edits, tolerances, quarantine) if edits else store
@@ -1,5 +1,18 @@
+import argparse
+import os
+import sys
 import pandas as pd
 
+# The journal and loader live at the repository root, next to the player CSV they read
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from playerData import NUMERIC_COLUMNS
+from statJournal import journal_path, read_journal, append_edit, apply_edits_to_frame, compact_journal
+
+# The CSV the loader reads, whose journal holds the edits, and the raw stats it is estimated from
+PLAYERS_CSV = os.path.join(ROOT_DIR, 'players_with_estimates.csv')
+RAW_STATS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'all_player_stats.csv')
+
 def search_player(df, player_name):
     # Search for the player by name
     player_data = df[df['Name'].str.lower() == player_name.lower()]
@@ -17,96 +30,55 @@ def print_stats(player_data):
         else:
             print(f"{column}: {value}")
 
-def update_stat(df, player_data, stat_to_update, new_value):
-    # Update the specific stat of the player
-    index = player_data.index[0]
-    df.at[index, stat_to_update] = new_value
-
-    # If 'fgm' or 'fga' are updated, recalculate 'fg%'
-    if stat_to_update in ['fgm', 'fga']:
-        recalculate_fg_percent(df, index)
-
-    if stat_to_update in ['ftm', 'fta']:
-        recalculate_ft_percent(df, index)
-
-    if stat_to_update in ['FG3M', 'FG3A']:
-        recalculate_3p_percent(df, index)
-
-def recalculate_fg_percent(df, index):
-    # Recalculate 'fg%' using the formula: (fgm / fga) * 100
-    fgm = df.at[index, 'fgm']
-    fga = df.at[index, 'fga']
-    
-    # Check for divide-by-zero scenario
-    if fga != 0:
-        fg_percent = (fgm / fga) * 100
-    else:
-        fg_percent = 0
-
-    # Update 'fg%' in the DataFrame
-    df.at[index, 'fg%'] = fg_percent
-
-def recalculate_ft_percent(df, index):
-    ftm = df.at[index, 'ftm']
-    fta = df.at[index, 'fta']
-    
-    # Check for divide-by-zero scenario
-    if fta != 0:
-        ft_percent = (ftm / fta) * 100
-    else:
-        ft_percent = 0
-
-    # Update 'fg%' in the DataFrame
-    df.at[index, 'ft%'] = ft_percent
-
-def recalculate_3p_percent(df, index):
-    # Recalculate 'fg%' using the formula: (fgm / fga) * 100
-    FG3M = df.at[index, 'FG3M']
-    FG3A = df.at[index, 'FG3A']
-    
-    # Check for divide-by-zero scenario
-    if FG3A != 0:
-        FG3P = (FG3M / FG3A) * 100
-    else:
-        FG3P = 0
-
-    # Update 'fg%' in the DataFrame
-    df.at[index, '3PT%'] = FG3P
-
+# Record a stat override in the journal and apply it to the in-memory table
+# The loader applies the journal on every load, re-estimating only the edited players, so
+# nothing is rewritten until the journal is compacted.
+def update_stat(df, journal, player_data, stat_to_update, new_value):
+    edit = append_edit(journal, player_data.iloc[0]['Name'], stat_to_update, new_value)
+    apply_edits_to_frame(df, [edit], NUMERIC_COLUMNS)
 
 def main():
-    # Read CSV into a DataFrame
-    df = pd.read_csv("all_player_stats.csv")
+    parser = argparse.ArgumentParser(description='Journal player stat edits, or fold the journal into the CSVs.')
+    parser.add_argument('--compact', action='store_true',
+                        help='Apply the journal to the player CSVs, rewriting each once, and clear it')
+    args = parser.parse_args()
+    journal = journal_path(PLAYERS_CSV)
+
+    if args.compact:
+        count = compact_journal(journal, [PLAYERS_CSV, RAW_STATS_CSV], NUMERIC_COLUMNS)
+        print(f"Compacted {count} edit(s) into {PLAYERS_CSV} and {RAW_STATS_CSV}.")
+        return
+
+    # Read CSV into a DataFrame, with the edits made so far applied
+    df = pd.read_csv(PLAYERS_CSV)
+    apply_edits_to_frame(df, read_journal(journal), NUMERIC_COLUMNS)
 
     while True:
         # Ask for the player's name
         player_name = input("Enter the name of the player: ")
-        
+
         # Search for the player
         player_data = search_player(df, player_name)
-        
+
         if player_data is not None:
             print("Found the following stats for the player:")
             print_stats(player_data)
-            
+
             # Ask for the stat to update
             stat_to_update = input("Enter the stat you want to change: ")
-            
-            if stat_to_update not in df.columns:
+
+            if stat_to_update not in NUMERIC_COLUMNS:
                 print("Invalid stat.")
                 continue
-            
+
             # Ask for the new value
             new_value = float(input(f"Enter the new value for {stat_to_update}: "))
-            
-            # Update the stat
-            update_stat(df, player_data, stat_to_update, new_value)
-            
-            # Save the updated DataFrame to CSV
-            df.to_csv("all_player_stats.csv", index=False)
-            
+
+            # Journal the update
+            update_stat(df, journal, player_data, stat_to_update, new_value)
+
             print("Stat updated.")
-        
+
         # Ask if the user wants to continue
         another = input("Do you want to update another player? (yes/no): ")
         if another.lower() != 'yes':
@@ -1,91 +1,83 @@
 import csv
+import os
+import sys
+from itertools import islice, zip_longest
+import numpy as np
+
+# The estimation itself lives at the repository root, where the loader reuses it for stat edits
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from statEstimates import ESTIMATED_FIELDS, estimate_shooting, round_2
 
 # Read the original CSV file
 input_filename = 'all_player_stats.csv'
 output_filename = 'players_with_estimates.csv'
 
-players = []
+fieldnames = ['Name', 'gp', 'min', 'fgp', 'ftp', '3pm', 'reb', 'ass', 'stl', 'bl', 'TOs', 'ppg', 'ftm', 'fta', 'fgm', 'fga']
 
-with open(input_filename, 'r') as csvfile:
-    reader = csv.DictReader(csvfile)
-    for row in reader:
-        players.append(row)
+# Rows read, estimated and written at a time, so memory stays flat for any input size
+CHUNK_SIZE = 50000
 
-# Process each player's stats and compute FTM, FTA, FGM, FGA
-for player in players:
+# Function to parse a column of strings like float(), marking the rows that fail
+# The whole column is converted at once; only a column holding a bad value falls back to
+# checking its values one by one.
+def parse_column(values):
     try:
-        # Convert string values to appropriate numeric types
-        ppg = float(player['ppg'])
-        fgp = float(player['fgp'])
-        ftp = float(player['ftp'])
-        three_pm = float(player['3pm'])
-
-        FTr = 0.25  # Average league free throw rate
-
-        # Step 1: Calculate Points from Three-Pointers
-        points_3pm = three_pm * 3
-
-        # Step 2: Calculate Adjusted PPG
-        adjusted_ppg = ppg - points_3pm
-
-        # Avoid division by zero
-        if fgp == 0:
-            C = 0
-        else:
-            # Step 3: Calculate Coefficient C
-            C = (FTr * ftp) / fgp
-
-        # Step 4: Compute Denominator
-        denominator = 2 + C
-
-        # Avoid division by zero
-        if denominator == 0:
-            two_pm = 0
-        else:
-            # Step 5: Compute Numerator
-            numerator = adjusted_ppg - (three_pm * C)
-
-            # Step 6: Calculate Two-Pointers Made
-            two_pm = numerator / denominator
-
-        # Ensure two_pm is not negative
-        two_pm = max(two_pm, 0)
-
-        # Step 7: Calculate Field Goals Made (FGM)
-        fgm = three_pm + two_pm
-
-        # Step 8: Calculate Field Goals Attempted (FGA)
-        if fgp > 0:
-            fga = fgm / fgp
-        else:
-            fga = 0
-
-        # Step 9: Calculate Free Throw Attempts (FTA)
-        fta = fga * FTr
-
-        # Step 10: Calculate Free Throws Made (FTM)
-        ftm = fta * ftp
-
-        # Add new fields to the player dictionary
-        player['ftm'] = round(ftm, 2)
-        player['fta'] = round(fta, 2)
-        player['fgm'] = round(fgm, 2)
-        player['fga'] = round(fga, 2)
-
+        return np.array(values).astype(np.float64), np.ones(len(values), dtype=bool)
     except ValueError:
-        # Handle cases where conversion to float fails
-        player['ftm'] = ''
-        player['fta'] = ''
-        player['fgm'] = ''
-        player['fga'] = ''
-
-# Write the updated data to a new CSV file
-fieldnames = ['Name', 'gp', 'min', 'fgp', 'ftp', '3pm', 'reb', 'ass', 'stl', 'bl', 'TOs', 'ppg', 'ftm', 'fta', 'fgm', 'fga']
-
-with open(output_filename, 'w', newline='') as csvfile:
-    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-    writer.writeheader()
-    for player in players:
-        writer.writerow(player)
-
-print(f"New CSV file '{output_filename}' has been created with additional columns.")
+        parsed = np.zeros(len(values))
+        valid = np.zeros(len(values), dtype=bool)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+                valid[i] = True
+            except ValueError:
+                pass
+        return parsed, valid
+
+# Function to format rounded values the way the csv module writes floats
+def format_column(values):
+    return np.array(list(map(repr, values.tolist())), dtype=object)
+
+# Function to estimate the missing shooting columns for one chunk of rows
+# Returns the output rows; rows whose stats don't parse get empty estimates.
+def process_chunk(rows, header):
+    # Transpose to columns, padding short rows with empty fields
+    columns = dict(zip(header, zip_longest(*rows, fillvalue='')))
+    blank = [''] * len(rows)
+
+    # Convert string values to numeric arrays, masking rows where any conversion fails
+    ppg, valid = parse_column(columns.get('ppg', blank))
+    fgp, fgp_valid = parse_column(columns.get('fgp', blank))
+    ftp, ftp_valid = parse_column(columns.get('ftp', blank))
+    three_pm, three_valid = parse_column(columns.get('3pm', blank))
+    valid &= fgp_valid & ftp_valid & three_valid
+
+    estimates = dict(zip(ESTIMATED_FIELDS, estimate_shooting(ppg, fgp, ftp, three_pm)))
+    for field, values in estimates.items():
+        text = format_column(round_2(values))
+        if field == 'fga':
+            text[~(fgp > 0)] = '0'  # The integer 0 when fgp is not positive
+        text[~valid] = ''
+        columns[field] = text.tolist()
+    return zip(*(columns.get(field, blank) for field in fieldnames))
+
+# Function to stream the input CSV through the estimator chunk by chunk
+def estimate_stats_file(input_path, output_path, chunk_size=CHUNK_SIZE):
+    with open(input_path, 'r') as infile, open(output_path, 'w', newline='') as outfile:
+        reader = csv.reader(infile)
+        writer = csv.writer(outfile)
+        header = next(reader)
+        writer.writerow(fieldnames)
+        # Blank lines are skipped, like csv.DictReader does
+        rows = filter(None, reader)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            writer.writerows(process_chunk(chunk, header))
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        input_filename, output_filename = sys.argv[1], sys.argv[2]
+    estimate_stats_file(input_filename, output_filename)
+    print(f"New CSV file '{output_filename}' has been created with additional columns.")
@@ -0,0 +1,115 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# Stat columns summed when aggregating a team, in matrix column order
+STAT_COLUMNS = ['fgm', 'fga', 'ftm', 'fta', '3pm', 'reb', 'ass', 'stl', 'bl', 'TOs', 'ppg']
+STAT_INDEX = {stat: i for i, stat in enumerate(STAT_COLUMNS)}
+
+# Class to hold player stats as a contiguous matrix with a name-to-row index
+class PlayerStore:
+    def __init__(self, names, matrix, total_z=None):
+        self.names = list(names)  # Player names, indexed by player ID
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float64)  # Players x STAT_COLUMNS
+        self.total_z = None if total_z is None else np.asarray(total_z, dtype=np.float64)  # Per-player total z-score
+        self.name_to_id = {}
+        for player_id, name in enumerate(self.names):
+            self.name_to_id.setdefault(name, player_id)  # First row wins, like df[df['Name'] == name].iloc[0]
+
+    def __len__(self):
+        return len(self.names)
+
+    # Convert player names to integer IDs, skipping players not in the store
+    def ids_for(self, players):
+        return [self.name_to_id[player] for player in players if player in self.name_to_id]
+
+    # Sum the stat rows of the given player IDs
+    def team_totals(self, player_ids):
+        if len(player_ids) == 0:
+            return np.zeros(len(STAT_COLUMNS))
+        return self.matrix[player_ids].sum(axis=0)
+
+# Class to list available players in a fixed ranking order without re-sorting the pool
+# Availability is an integer bitmask of player IDs; a cursor marks the first slot in the
+# ordering that may still be available, so scans start past players already drafted.
+class AvailabilityIndex:
+    def __init__(self, keys, descending=True):
+        keys = np.asarray(keys, dtype=np.float64)
+        self.order = np.argsort(-keys if descending else keys, kind='stable').tolist()  # Player IDs, best first
+
+    def __len__(self):
+        return len(self.order)
+
+    # Advance a cursor past players that are no longer available
+    def advance(self, available, cursor=0):
+        order = self.order
+        while cursor < len(order) and not (available >> order[cursor]) & 1:
+            cursor += 1
+        return cursor
+
+    # First n available player IDs in ranking order, scanning from the cursor
+    def top_available(self, available, n, cursor=0):
+        order = self.order
+        picks = []
+        position = cursor
+        while position < len(order) and len(picks) < n:
+            player_id = order[position]
+            if (available >> player_id) & 1:
+                picks.append(player_id)
+            position += 1
+        return picks
+
+# Function to expand an availability bitmask into a boolean array over player IDs
+def availability_mask(available, num_players):
+    packed = np.frombuffer(available.to_bytes((num_players + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(packed, bitorder='little')[:num_players].astype(bool)
+
+# Function to build the player store from the loaded DataFrame
+def build_player_store(df):
+    matrix = np.column_stack([
+        df[col].to_numpy(dtype=np.float64) if col in df.columns else np.zeros(len(df))
+        for col in STAT_COLUMNS
+    ])
+    total_z = df['total_z'].to_numpy(dtype=np.float64) if 'total_z' in df.columns else None
+    return PlayerStore(df['Name'].tolist(), matrix, total_z)
+
+# Function to copy the store's arrays into one shared-memory block for worker processes
+# The block holds the stat matrix followed by total_z. Returns the block (the caller must
+# close and unlink it) and a small picklable descriptor.
+def share_player_store(store):
+    num_players, num_stats = store.matrix.shape
+    total_z = store.total_z if store.total_z is not None else np.zeros(num_players)
+    shm = shared_memory.SharedMemory(create=True, size=max(store.matrix.nbytes + total_z.nbytes, 1))
+    matrix = np.ndarray((num_players, num_stats), dtype=np.float64, buffer=shm.buf)
+    matrix[:] = store.matrix
+    np.ndarray(num_players, dtype=np.float64, buffer=shm.buf, offset=matrix.nbytes)[:] = total_z
+    descriptor = {
+        'shm_name': shm.name,
+        'shape': (num_players, num_stats),
+        'names': store.names,
+        'has_total_z': store.total_z is not None
+    }
+    return shm, descriptor
+
+# Function to build a store whose arrays are read-only views onto a shared-memory block
+# Returns the store and the attached block, which must stay referenced while the store is in use.
+def attach_player_store(descriptor):
+    shm = shared_memory.SharedMemory(name=descriptor['shm_name'])
+    num_players, num_stats = descriptor['shape']
+    matrix = np.ndarray((num_players, num_stats), dtype=np.float64, buffer=shm.buf)
+    total_z = None
+    if descriptor['has_total_z']:
+        total_z = np.ndarray(num_players, dtype=np.float64, buffer=shm.buf, offset=matrix.nbytes)
+        total_z.flags.writeable = False
+    matrix.flags.writeable = False
+    return PlayerStore(descriptor['names'], matrix, total_z), shm
+
+# Function to turn a totals vector into the team stats dict used for standings
+def totals_to_stats(totals):
+    stats = {stat: float(totals[i]) for i, stat in enumerate(STAT_COLUMNS)}
+    stats['fg%'] = (stats['fgm'] / stats['fga']) * 100 if stats['fga'] != 0 else 0
+    stats['ft%'] = (stats['ftm'] / stats['fta']) * 100 if stats['fta'] != 0 else 0
+    return stats
+
+# Function to aggregate team statistics
+def aggregate_team_stats(team, store):
+    return totals_to_stats(store.team_totals(store.ids_for(team)))
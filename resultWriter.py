@@ -0,0 +1,183 @@
+import json
+import os
+
+# Output formats accepted by run_simulations, with their default paths
+DEFAULT_OUTPUTS = {
+    'jsonl': 'best_teams.jsonl',
+    'parquet': 'best_teams_parquet',
+    'text': 'best_teams.txt'
+}
+
+# Function to make an entry JSON-safe (e.g. integer percentile keys become strings)
+def normalize_entry(entry):
+    return json.loads(json.dumps(entry))
+
+# Key of the record a JSONL results file gets after each finished position's entries
+COMPLETION_KEY = 'completed_position'
+
+# Function to cut an interrupted write's partial last line before appending to a file
+def drop_partial_line(path):
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+# Function to cut a JSONL results file back to its last completion record before appending
+# A crash mid-position can leave some of its entries behind; they are dropped so the position
+# is written again in full.
+def drop_incomplete_position(path):
+    marker = b'{"' + COMPLETION_KEY.encode() + b'"'
+    with open(path, 'rb+') as f:
+        data = f.read()
+        data = data[:data.rfind(b'\n') + 1]  # A partial last line never completes a position
+        start = data.rfind(b'\n' + marker) + 1
+        if start == 0 and not data.startswith(marker):
+            f.truncate(0)  # No position was finished
+            return
+        f.truncate(data.find(b'\n', start) + 1)
+
+# Class to append each position's results to a line-delimited JSON file as they finish
+# Every batch ends with a completion record ({"completed_position": ..., "entries": ...}) and
+# is flushed and fsynced, so a crashed sweep keeps the positions it finished, and resuming
+# drops the entries of a position it didn't.
+class JsonlResultWriter:
+    def __init__(self, path, append=False):
+        self.path = path
+        if append and os.path.exists(path):
+            self.drop_incomplete(path)
+        self.file = open(path, 'a' if append else 'w')
+
+    def drop_incomplete(self, path):
+        drop_incomplete_position(path)
+
+    def write_position(self, entries, position=None):
+        for entry in entries:
+            self.file.write(json.dumps(entry) + '\n')
+        if position is None:
+            position = entries[0]['position']
+        self.file.write(json.dumps({COMPLETION_KEY: position, 'entries': len(entries)}) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Class to write each position's results as its own Parquet file in a dataset directory
+# Files are written to a temporary name and renamed, so a crash never leaves a partial file.
+class ParquetResultWriter:
+    def __init__(self, path, append=False):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("The parquet output format needs pyarrow (pip install pyarrow).")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if not append:
+            for name in os.listdir(path):
+                if name.endswith('.parquet'):
+                    os.remove(os.path.join(path, name))
+
+    def write_position(self, entries, position=None):
+        if not entries:
+            return
+        table = self.pa.Table.from_pylist([normalize_entry(entry) for entry in entries])
+        final_path = os.path.join(self.path, f"position_{entries[0]['position']}.parquet")
+        temp_path = final_path + '.tmp'
+        self.pq.write_table(table, temp_path)
+        os.replace(temp_path, final_path)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Class to append each position's results in the human-readable best_teams.txt layout
+class TextResultWriter(JsonlResultWriter):
+    def drop_incomplete(self, path):
+        drop_partial_line(path)
+
+    def write_position(self, entries, position=None):
+        f = self.file
+        for entry in entries:
+            f.write(f"Total Roto Score: {entry['total_roto_score']}\n")
+            f.write(f"Draft Position: {entry['position']}\n")
+            f.write(f"Team: {entry['team']}\n")
+            f.write(f"Category Rankings: {entry['category_rankings']}\n")
+            f.write(f"Second Best Team: {entry['second_best_team']}\n")
+            f.write(f"Second Best Team Roster: {entry['second_best_team_roster']}\n")
+            f.write(f"Second Best Total Roto Score: {entry['second_best_total_roto_score']}\n")
+            f.write(f"Second Best Category Rankings: {entry['second_best_category_rankings']}\n")
+            f.write(f"Team Stats: {entry['team_stats']}\n")
+            if entry.get('rollout_stats') is not None:
+                f.write(f"Rollout Roto Score: {entry['rollout_stats']}\n")
+            f.write("=" * 40 + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+# Function to open the writer for an output format
+def open_result_writer(output_format, path=None, append=False):
+    writers = {'jsonl': JsonlResultWriter, 'parquet': ParquetResultWriter, 'text': TextResultWriter}
+    if output_format not in writers:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return writers[output_format](path or DEFAULT_OUTPUTS[output_format], append=append)
+
+# Function to lazily read results, optionally filtered by draft position and minimum score
+# Reads a JSONL file line by line, or a Parquet dataset directory batch by batch.
+def iter_results(path, position=None, min_score=None):
+    if os.path.isdir(path):
+        yield from iter_parquet_results(path, position, min_score)
+        return
+    with open(path) as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break  # Partial last line from an interrupted write
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if COMPLETION_KEY in entry:
+                continue
+            if position is not None and entry['position'] != position:
+                continue
+            if min_score is not None and entry['total_roto_score'] < min_score:
+                continue
+            yield entry
+
+def iter_parquet_results(path, position=None, min_score=None):
+    import pyarrow.dataset as ds
+    dataset = ds.dataset(path, format='parquet')
+    condition = None
+    if position is not None:
+        condition = ds.field('position') == position
+    if min_score is not None:
+        score_condition = ds.field('total_roto_score') >= min_score
+        condition = score_condition if condition is None else condition & score_condition
+    for batch in dataset.to_batches(filter=condition):
+        yield from batch.to_pylist()
+
+# Function to list the draft positions a results file or directory holds in full
+# In a JSONL file, those are the positions with a completion record.
+def completed_positions(path):
+    if not os.path.exists(path):
+        return set()
+    if os.path.isdir(path):
+        return {int(name[len('position_'):-len('.parquet')]) for name in os.listdir(path)
+                if name.startswith('position_') and name.endswith('.parquet')}
+    completed = set()
+    with open(path) as f:
+        for line in f:
+            if line.startswith('{"' + COMPLETION_KEY + '"') and line.endswith('\n'):
+                completed.add(json.loads(line)[COMPLETION_KEY])
+    return completed
@@ -1,83 +1,14 @@
-import pandas as pd
 import numpy as np
-from fuzzywuzzy import process
-
-# Function to calculate z-scores for players
-def calculate_z_scores(df, categories):
-    z_scores = pd.DataFrame()
-    for cat in categories:
-        if cat in ['fg%', 'ft%']:
-            continue  # Skip percentages for now
-        mean = df[cat].mean()
-        std = df[cat].std()
-        if std == 0:
-            z_scores[cat] = 0
-        else:
-            z_scores[cat] = (df[cat] - mean) / std
-    # Handle percentages separately
-    for cat in ['fg%', 'ft%']:
-        mean = df[cat].mean()
-        std = df[cat].std()
-        if std == 0:
-            z_scores[cat] = 0
-        else:
-            z_scores[cat] = (df[cat] - mean) / std
-    # Turnovers are minimized
-    if 'TOs' in z_scores.columns:
-        z_scores['TOs'] = -z_scores['TOs']  # Since fewer turnovers are better
-    # Sum z-scores across all categories
-    z_scores['total_z'] = z_scores.sum(axis=1)
-    df['total_z'] = z_scores['total_z']
-    return df
-
-# Function to aggregate team statistics
-def aggregate_team_stats(team, df):
-    stats = {
-        'fgm': 0.0, 'fga': 0.0, 'ftm': 0.0, 'fta': 0.0,
-        '3pm': 0.0, 'reb': 0.0, 'ass': 0.0, 'stl': 0.0,
-        'bl': 0.0, 'TOs': 0.0, 'ppg': 0.0
-    }
-    for player in team:
-        player_stats = df[df['Name'] == player]
-        if player_stats.empty:
-            continue  # Skip if player not found
-        player_stats = player_stats.iloc[0]
-        for key in stats.keys():
-            stats[key] += float(player_stats[key])
-    # Calculate percentages
-    stats['fg%'] = (stats['fgm'] / stats['fga']) * 100 if stats['fga'] != 0 else 0
-    stats['ft%'] = (stats['ftm'] / stats['fta']) * 100 if stats['fta'] != 0 else 0
-    return stats
-
-# Function to calculate roto standings
-def calculate_roto_standings(teams_stats):
-    categories = ['ppg', 'reb', 'ass', 'stl', 'bl', 'fg%', 'ft%', '3pm', 'TOs']
-    teams_scores = {team: {} for team in teams_stats.keys()}
-    # Prepare category data
-    category_data = {cat: [] for cat in categories}
-    for team, stats in teams_stats.items():
-        for cat in categories:
-            value = stats.get(cat, 0)
-            if cat == 'TOs':
-                category_data[cat].append((team, -value))  # Negative because TOs are minimized
-            else:
-                category_data[cat].append((team, value))
-    # Rank teams in each category
-    for cat in categories:
-        # Handle possible NaN values
-        category_values = [(team, value if not np.isnan(value) else 0) for team, value in category_data[cat]]
-        category_values.sort(key=lambda x: x[1], reverse=True)
-        for rank, (team, value) in enumerate(category_values, start=1):
-            teams_scores[team][cat] = len(teams_stats) - rank + 1  # Higher value gets higher rank
-    return teams_scores
-
-# Function to evaluate total roto score
-def evaluate_roto_score(team_scores):
-    total_score = sum(team_scores.values())
-    return total_score
+from concurrent.futures import ThreadPoolExecutor
+from playerStore import STAT_COLUMNS, AvailabilityIndex, availability_mask, totals_to_stats
+from rotoStandings import CATEGORIES, rank_roto_standings, totals_to_categories
+from nameIndex import NameIndex
+from playerData import load_player_store
+from runningZScores import RunningZScores
+from endgameSolver import ENDGAME_PICKS, solve_endgame
 
 # Function to calculate combined score with dynamic weighting
-def calculate_combined_score(z_score, roto_score, current_round, total_rounds):
+def calculate_combined_score(z_score, roto_score, current_round, total_rounds, num_teams):
     # Determine weights based on the current round
     if current_round <= 6:
         z_weight = 0.7
@@ -90,7 +21,7 @@ def calculate_combined_score(z_score, roto_score, current_round, total_rounds):
     # z_weight = max(0.1, 1 - (current_round / total_rounds))
     # roto_weight = 1 - z_weight
     # Normalize the roto_score to a 0-1 scale
-    roto_score_normalized = roto_score / (9 * total_teams)
+    roto_score_normalized = roto_score / (9 * num_teams)
     combined_score = (z_weight * z_score_normalized(z_score)) + (roto_weight * roto_score_normalized)
     return combined_score
 
@@ -100,56 +31,249 @@ def z_score_normalized(z_score):
     z_min, z_max = -5, 10
     return (z_score - z_min) / (z_max - z_min)
 
-# Function to suggest top picks based on different rankings
-def suggest_top_picks(my_team, available_players, teams, df, current_round, num_suggestions=10, total_rounds=13):
-    # Initialize list to store suggestions
-    suggestions = []
-    teams_stats = {name: aggregate_team_stats(team, df) for name, team in teams.items()}
+# Function to pick the indices of the k largest values, earlier candidates winning ties
+def top_k_indices(values, k):
+    k = min(k, len(values))
+    if k == 0:
+        return np.array([], dtype=int)
+    threshold = values[np.argpartition(-values, k - 1)[:k]].min()
+    above = np.flatnonzero(values > threshold)
+    tied = np.flatnonzero(values == threshold)[:k - len(above)]
+    chosen = np.concatenate([above, tied])
+    return chosen[np.lexsort((chosen, -values[chosen]))]
 
-    # Precompute opponents' stats to save time
-    opponents = {name: stats for name, stats in teams_stats.items() if name != 'me'}
+# Function to build one league per candidate, with that candidate's stats added to my totals
+def candidate_leagues(team_totals, my_index, candidate_ids, store):
+    league_totals = np.repeat(team_totals[None, :, :], len(candidate_ids), axis=0)
+    league_totals[:, my_index] += store.matrix[candidate_ids]
+    return league_totals
+
+# Function to rank every candidate's league in one call and return my roto score and rank in each
+def rank_candidate_leagues(league_totals, my_index):
+    _, total_scores = rank_roto_standings(totals_to_categories(league_totals))
+    roto_scores = total_scores[:, my_index]
+    # Projected ranking: teams ahead on score, plus teams listed before me on a tie
+    ranks = 1 + (total_scores > roto_scores[:, None]).sum(axis=1)
+    ranks += (total_scores[:, :my_index] == roto_scores[:, None]).sum(axis=1)
+    return roto_scores, ranks
+
+# Function to build the three suggestion lists from scored candidates
+def build_suggestion_lists(candidates, roto_scores, ranks, z_scores, current_round, num_suggestions, total_rounds,
+                           num_teams):
+    combined_scores = calculate_combined_score(z_scores, roto_scores, current_round, total_rounds, num_teams)
+
+    def build_list(key):
+        return [{
+            'player': candidates[i],
+            'roto_score': int(roto_scores[i]),
+            'rank': int(ranks[i]),
+            'z_score': float(z_scores[i]),
+            'combined_score': float(combined_scores[i])
+        } for i in top_k_indices(key, num_suggestions)]
 
-    # Iterate over available players
-    for player in available_players:
-        # Get player's z-score
-        player_z = df[df['Name'] == player]['total_z'].values[0]
-        # Create a temporary team with the player added
-        temp_team = my_team + [player]
-        teams_stats_temp = teams_stats.copy()
-        teams_stats_temp['me'] = aggregate_team_stats(temp_team, df)
-        # Calculate roto standings
-        teams_scores = calculate_roto_standings(teams_stats_temp)
-        my_roto_score = evaluate_roto_score(teams_scores['me'])
-        # Determine your projected ranking
-        total_scores = [(name, evaluate_roto_score(scores)) for name, scores in teams_scores.items()]
-        total_scores.sort(key=lambda x: x[1], reverse=True)
-        my_rank = [i+1 for i, (name, score) in enumerate(total_scores) if name == 'me'][0]
-        # Calculate combined score
-        combined_score = calculate_combined_score(player_z, my_roto_score, current_round, total_rounds)
-        suggestions.append({
-            'player': player,
-            'roto_score': my_roto_score,
-            'rank': my_rank,
-            'z_score': player_z,
-            'combined_score': combined_score
-        })
     # Generate three separate lists
     # List A: Ranked by projected roto score
-    list_a = sorted(suggestions, key=lambda x: -x['roto_score'])[:num_suggestions]
+    list_a = build_list(roto_scores)
     # List B: Ranked by player z-score
-    list_b = sorted(suggestions, key=lambda x: -x['z_score'])[:num_suggestions]
+    list_b = build_list(z_scores)
     # List C: Combined ranking
-    list_c = sorted(suggestions, key=lambda x: -x['combined_score'])[:num_suggestions]
+    list_c = build_list(combined_scores)
     return list_a, list_b, list_c
 
+# Function to pick each candidate's z-score for the suggestion lists
+# 'pool' is the loader's z-score over every player; 'remaining' scores candidates against
+# the players still available, so categories thinned out by the draft count for more.
+def candidate_z_scores(store, candidate_ids, z_ranking, z_engine=None):
+    if z_ranking == 'pool':
+        return store.total_z[candidate_ids]
+    if z_ranking == 'remaining':
+        return z_engine.total_z(candidate_ids)
+    raise ValueError(f"Unknown z-score ranking: {z_ranking}")
+
+# Function to suggest top picks based on different rankings
+def suggest_top_picks(my_team, available_players, teams, store, current_round, num_suggestions=10, total_rounds=13,
+                      z_ranking='pool'):
+    team_names = list(teams.keys())
+    my_index = team_names.index('me')
+    team_totals = np.array([store.team_totals(store.ids_for(team)) for team in teams.values()])
+
+    # Broadcast-add every available player's stats to my current totals
+    candidates = [player for player in available_players if player in store.name_to_id]
+    candidate_ids = np.array([store.name_to_id[player] for player in candidates], dtype=int)
+    roto_scores, ranks = rank_candidate_leagues(candidate_leagues(team_totals, my_index, candidate_ids, store), my_index)
+    z_engine = None
+    if z_ranking == 'remaining':
+        # Take every player no longer available out of the pool's running moments
+        z_engine = RunningZScores(store)
+        for player_id in np.setdiff1d(np.arange(len(store)), candidate_ids):
+            z_engine.remove(player_id)
+    z_scores = candidate_z_scores(store, candidate_ids, z_ranking, z_engine)
+    return build_suggestion_lists(candidates, roto_scores, ranks, z_scores, current_round, num_suggestions, total_rounds,
+                                  len(team_names))
+
+# Function to score every candidate against a (possibly predicted) league state
+# Runs on the background worker; the returned cache is patched when the real picks differ.
+def score_candidate_cache(team_totals, available, my_index, store):
+    candidate_ids = np.flatnonzero(availability_mask(available, len(store)))
+    league_totals = candidate_leagues(team_totals, my_index, candidate_ids, store)
+    roto_scores, ranks = rank_candidate_leagues(league_totals, my_index)
+    return {
+        'team_totals': team_totals,
+        'ids': candidate_ids,
+        'league_totals': league_totals,
+        'roto_scores': roto_scores,
+        'ranks': ranks
+    }
+
+# Class to track a live draft incrementally and precompute my next suggestions in the background
+# Team totals and availability are updated per pick instead of re-aggregating every roster.
+# After each pick, a worker thread scores my next turn's candidates against a prediction of
+# the opponent picks before it (each takes the best available player by total z). When my
+# turn comes, the cached scores are patched for the picks that went differently. Once my
+# next turn starts the endgame, the exact plan for that turn is solved after the scoring and
+# used when the board matches the prediction.
+# With z_ranking='remaining', suggestions use z-scores against the players still available,
+# kept current by removing each pick from running moments.
+class LiveDraft:
+    def __init__(self, store, team_names, draft_sequence, available_players, z_ranking='pool'):
+        self.store = store
+        self.team_names = list(team_names)
+        self.my_index = self.team_names.index('me')
+        self.sequence = [self.team_names.index(drafter) for drafter in draft_sequence]
+        self.team_totals = np.zeros((len(self.team_names), len(STAT_COLUMNS)))
+        self.available = 0
+        for player in available_players:
+            if player in store.name_to_id:
+                self.available |= 1 << store.name_to_id[player]
+        self.index = AvailabilityIndex(store.total_z)
+        self.z_ranking = z_ranking
+        self.z_engine = None
+        if z_ranking == 'remaining':
+            self.z_engine = RunningZScores(store)
+            for player_id in np.flatnonzero(~availability_mask(self.available, len(store))):
+                self.z_engine.remove(player_id)
+        self.cursor = 0
+        self.pick = 0
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.future = None
+        self.endgame = None  # (future, pick, team totals, availability) of a speculative endgame solve
+        self.predicted = {}  # Pick number -> predicted player ID for the pending speculation
+        self.speculate()
+
+    # Apply a pick to the current drafter's totals and refresh the speculation if it missed
+    def record_pick(self, player):
+        team_index = self.sequence[self.pick]
+        player_id = self.store.name_to_id.get(player)
+        if player_id is not None:
+            self.team_totals[team_index] += self.store.matrix[player_id]
+            if self.z_engine is not None and (self.available >> player_id) & 1:
+                self.z_engine.remove(player_id)
+            self.available &= ~(1 << player_id)
+        predicted = self.predicted.pop(self.pick, None)
+        self.pick += 1
+        if team_index == self.my_index or predicted != player_id:
+            self.speculate()
+
+    # Submit background scoring for my next turn, assuming greedy opponent picks until then
+    def speculate(self):
+        if self.future is not None:
+            self.future.cancel()
+        if self.endgame is not None:
+            self.endgame[0].cancel()
+            self.endgame = None
+        team_totals = self.team_totals.copy()
+        available = self.available
+        self.cursor = self.index.advance(available, self.cursor)
+        cursor = self.cursor
+        self.predicted = {}
+        pick = self.pick
+        if self.my_index not in self.sequence[pick:]:
+            self.future = None  # No turns left to prepare for
+            return
+        while self.sequence[pick] != self.my_index:
+            cursor = self.index.advance(available, cursor)
+            if cursor == len(self.index):
+                break
+            player_id = self.index.order[cursor]
+            team_totals[self.sequence[pick]] += self.store.matrix[player_id]
+            available &= ~(1 << player_id)
+            self.predicted[pick] = player_id
+            pick += 1
+        self.future = self.executor.submit(score_candidate_cache, team_totals, available, self.my_index, self.store)
+        remaining = self.sequence[pick:]
+        if remaining[0] == self.my_index and remaining.count(self.my_index) <= ENDGAME_PICKS:
+            endgame = self.executor.submit(solve_endgame, self.store, team_totals, available, remaining, self.my_index,
+                                           self.index)
+            self.endgame = (endgame, pick, team_totals, available)
+
+    # Patch a speculative cache to the actual league state
+    def patch(self, cache):
+        actual_ids = np.flatnonzero(availability_mask(self.available, len(self.store)))
+        keep = np.isin(cache['ids'], actual_ids)
+        new_ids = np.setdiff1d(actual_ids, cache['ids'])
+        ids = np.concatenate([cache['ids'][keep], new_ids])
+        new_leagues = candidate_leagues(self.team_totals, self.my_index, new_ids, self.store)
+        if np.array_equal(cache['team_totals'], self.team_totals):
+            # Opponents as predicted: only players the prediction took need scoring
+            roto_scores, ranks = rank_candidate_leagues(new_leagues, self.my_index)
+            roto_scores = np.concatenate([cache['roto_scores'][keep], roto_scores])
+            ranks = np.concatenate([cache['ranks'][keep], ranks])
+        else:
+            # Reuse my side of every cached league, swap in the actual opponent totals and re-rank
+            league_totals = cache['league_totals'][keep]
+            opponents = np.arange(len(self.team_names)) != self.my_index
+            league_totals[:, opponents] = self.team_totals[opponents]
+            roto_scores, ranks = rank_candidate_leagues(np.concatenate([league_totals, new_leagues]), self.my_index)
+        order = np.argsort(ids, kind='stable')
+        return ids[order], roto_scores[order], ranks[order]
+
+    # My suggestion lists for the current pick, from the patched background result
+    def suggestions(self, current_round, num_suggestions=10, total_rounds=13):
+        ids, roto_scores, ranks = self.patch(self.future.result())
+        candidates = [self.store.names[player_id] for player_id in ids]
+        return build_suggestion_lists(candidates, roto_scores, ranks,
+                                      candidate_z_scores(self.store, ids, self.z_ranking, self.z_engine),
+                                      current_round, num_suggestions, total_rounds, len(self.team_names))
+
+    # My remaining picks solved exactly, once no more than ENDGAME_PICKS are left
+    # Returns None before then; otherwise the players to take in order, my projected roto score
+    # and the solver's search counts. The background solve is used if opponents picked as
+    # predicted; otherwise the plan is solved now.
+    def endgame_plan(self):
+        remaining = self.sequence[self.pick:]
+        if remaining.count(self.my_index) > ENDGAME_PICKS:
+            return None
+        if self.endgame is not None and self.endgame[1] == self.pick and self.endgame[3] == self.available \
+                and np.array_equal(self.endgame[2], self.team_totals):
+            result = self.endgame[0].result()
+        else:
+            result = solve_endgame(self.store, self.team_totals, self.available, remaining, self.my_index, self.index)
+        return {**result, 'plan': [self.store.names[player_id] for player_id in result['plan']]}
+
+    # Current category points and total roto scores for every team
+    def standings(self):
+        return rank_roto_standings(totals_to_categories(self.team_totals))
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+# Function to ask which of the closest matching names was meant, until a listed number is entered
+def choose_match(matches):
+    print("Did you mean one of these players?")
+    for i, player in enumerate(matches):
+        print(f"{i+1}. {player}")
+    while True:
+        selected = input("Select the number corresponding to your choice: ").strip()
+        if selected.isdigit() and 1 <= int(selected) <= len(matches):
+            return matches[int(selected) - 1]
+        print(f"Enter a number from 1 to {len(matches)}.")
+
 # Simulate the draft
-def simulate_draft(df, draft_order):
+def simulate_draft(store, draft_order, z_ranking='pool'):
     num_teams = len(draft_order)
-    global total_teams  # Make total_teams accessible in other functions
-    total_teams = num_teams
     teams = {name.strip(): [] for name in draft_order}
-    available_players = set(df['Name'].values)
-    total_picks = len(df)  # Or set a fixed number of rounds
+    available_players = set(store.names)
+    total_picks = len(store)  # Or set a fixed number of rounds
     picks_made = 0
 
     # Prepare the draft sequence for the number of rounds you want
@@ -162,6 +286,11 @@ def simulate_draft(df, draft_order):
         else:
             draft_sequence.extend([name.strip() for name in reversed(draft_order)])
 
+    # Track totals incrementally; suggestions for my next turn are computed while waiting on input
+    draft = LiveDraft(store, teams.keys(), draft_sequence, available_players, z_ranking)
+    # Trigram index for correcting mistyped names, shrunk as players are drafted
+    name_index = NameIndex(available_players)
+
     # Start the draft
     current_pick = 0
     for drafter in draft_sequence:
@@ -169,9 +298,7 @@ def simulate_draft(df, draft_order):
         current_pick += 1
         if drafter == 'me':
             # Suggest top picks
-            list_a, list_b, list_c = suggest_top_picks(
-                teams['me'], available_players, teams, df, current_round, total_rounds
-            )
+            list_a, list_b, list_c = draft.suggestions(current_round, total_rounds)
             print(f"\nRound {current_round} - Your turn to pick!")
             print("\nTop suggestions for you (Ranked by Projected Roto Score Impact):")
             for idx, suggestion in enumerate(list_a):
@@ -185,37 +312,38 @@ def simulate_draft(df, draft_order):
             for idx, suggestion in enumerate(list_c):
                 print(f"{idx+1}. {suggestion['player']} (Combined Score: {suggestion['combined_score']:.4f}, "
                       f"Z-Score: {suggestion['z_score']:.2f}, Projected Roto Score: {suggestion['roto_score']})")
+            # In the last rounds, also show the best set of remaining picks
+            endgame = draft.endgame_plan()
+            if endgame is not None and endgame['plan']:
+                print(f"\nBest remaining picks if opponents take the top z-scores "
+                      f"(Projected Roto Score: {endgame['roto_score']:.0f}): {', '.join(endgame['plan'])}")
             # Let user select a player
             player_picked = input("Enter the name of the player you pick: ").strip()
             if player_picked not in available_players:
                 # Find the top 5 most similar player names
-                closest_matches = process.extract(player_picked, available_players, limit=5)
-                print("Did you mean one of these players?")
-                for i, (player, score) in enumerate(closest_matches):
-                    print(f"{i+1}. {player}")
-                selected = int(input("Select the number corresponding to your choice: ")) - 1
-                player_picked = closest_matches[selected][0]
+                closest_matches = name_index.extract(player_picked, limit=5)
+                player_picked = choose_match([player for player, score in closest_matches])
             # Update team and available players
             teams['me'].append(player_picked)
             available_players.remove(player_picked)
+            draft.record_pick(player_picked)
+            name_index.remove(player_picked)
             print(f"You picked {player_picked}.")
         else:
             player_picked = input(f"Round {current_round} - {drafter}'s turn to pick. Who did they pick? ").strip()
             if player_picked not in available_players:
                 # Find the top 5 most similar player names
-                closest_matches = process.extract(player_picked, available_players, limit=5)
-                print("Did you mean one of these players?")
-                for i, (player, score) in enumerate(closest_matches):
-                    print(f"{i+1}. {player}")
-                selected = int(input("Select the number corresponding to your choice: ")) - 1
-                player_picked = closest_matches[selected][0]
+                closest_matches = name_index.extract(player_picked, limit=5)
+                player_picked = choose_match([player for player, score in closest_matches])
             teams[drafter].append(player_picked)
             available_players.remove(player_picked)
+            draft.record_pick(player_picked)
+            name_index.remove(player_picked)
             print(f"{drafter} picked {player_picked}.")
 
         # After each pick, calculate and display your projected roto score and ranking
-        teams_stats = {name: aggregate_team_stats(team, df) for name, team in teams.items()}
-        teams_scores = {name: evaluate_roto_score(scores) for name, scores in calculate_roto_standings(teams_stats).items()}
+        points, scores = draft.standings()
+        teams_scores = dict(zip(teams.keys(), scores.tolist()))
         sorted_scores = sorted(teams_scores.items(), key=lambda x: x[1], reverse=True)
         my_roto_score = teams_scores['me']
         my_rank = [i+1 for i, (name, score) in enumerate(sorted_scores) if name == 'me'][0]
@@ -224,7 +352,7 @@ def simulate_draft(df, draft_order):
 
         # Display your current team stats after your pick
         if drafter == 'me':
-            my_stats = teams_stats['me']
+            my_stats = totals_to_stats(draft.team_totals[draft.my_index])
             print(f"\nYour team so far: {teams['me']}")
             print("Your aggregated team stats:")
             for stat, value in my_stats.items():
@@ -234,29 +362,18 @@ def simulate_draft(df, draft_order):
                     print(f"{stat}: {value:.2f}")
 
             # Show your category ranks
-            my_category_ranks = calculate_roto_standings(teams_stats)['me']
+            my_category_ranks = dict(zip(CATEGORIES, points[draft.my_index].tolist()))
             print("\nYour category ranks:")
             for cat, rank in my_category_ranks.items():
                 print(f"{cat}: Rank {rank}")
 
-if __name__ == "__main__":
-    # Load the player data
-    df = pd.read_csv('players_with_estimates.csv')
-    # Ensure numerical columns are correctly typed
-    numeric_cols = ['gp', 'min', 'fgp', 'ftp', '3pm', 'reb', 'ass', 'stl', 'bl', 'TOs', 'ppg',
-                    'ftm', 'fta', 'fgm', 'fga']
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    # Calculate percentages
-    df['fg%'] = (df['fgm'] / df['fga']) * 100
-    df['ft%'] = (df['ftm'] / df['fta']) * 100
+    draft.close()
 
-    # Calculate z-scores for all players
-    categories = ['ppg', 'reb', 'ass', 'stl', 'bl', '3pm', 'fg%', 'ft%', 'TOs']
-    df = calculate_z_scores(df, categories)
+if __name__ == "__main__":
+    # Load the player store, compiled from the CSV on first use and cached for later runs
+    store = load_player_store('players_with_estimates.csv')
 
     # Get the draft order
     draft_order_input = input("Enter the draft order separated by commas (include 'me' where appropriate): ")
     draft_order = draft_order_input.strip().split(",")
-    simulate_draft(df, draft_order)
\ No newline at end of file
+    simulate_draft(store, draft_order)
\ No newline at end of file
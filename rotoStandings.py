@@ -0,0 +1,54 @@
+import numpy as np
+from playerStore import STAT_INDEX
+
+# Roto categories in ranking order
+CATEGORIES = ['ppg', 'reb', 'ass', 'stl', 'bl', 'fg%', 'ft%', '3pm', 'TOs']
+TOS_INDEX = CATEGORIES.index('TOs')
+
+# Function to turn stat totals (..., STAT_COLUMNS) into category values (..., CATEGORIES)
+def totals_to_categories(totals):
+    totals = np.asarray(totals, dtype=np.float64)
+    fgm, fga = totals[..., STAT_INDEX['fgm']], totals[..., STAT_INDEX['fga']]
+    ftm, fta = totals[..., STAT_INDEX['ftm']], totals[..., STAT_INDEX['fta']]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fg_pct = np.where(fga != 0, (fgm / fga) * 100, 0.0)
+        ft_pct = np.where(fta != 0, (ftm / fta) * 100, 0.0)
+    columns = []
+    for cat in CATEGORIES:
+        if cat == 'fg%':
+            columns.append(fg_pct)
+        elif cat == 'ft%':
+            columns.append(ft_pct)
+        else:
+            columns.append(totals[..., STAT_INDEX[cat]])
+    return np.stack(columns, axis=-1)
+
+# Function to rank teams in every category for a batch of league states
+# values has shape (..., teams, len(CATEGORIES)); returns per-category points and total roto scores.
+# Ties: 'order' gives the earlier team in the league order the higher points (the original
+# sort behaviour), 'average' splits the tied points evenly.
+def rank_roto_standings(values, ties='order'):
+    values = np.array(values, dtype=np.float64)
+    values[np.isnan(values)] = 0  # NaN ranks as zero
+    values[..., TOS_INDEX] = -values[..., TOS_INDEX]  # Negative because TOs are minimized
+    num_teams = values.shape[-2]
+    if ties == 'order':
+        order = np.argsort(-values, axis=-2, kind='stable')
+        ranks = np.empty_like(order)
+        positions = np.broadcast_to(np.arange(num_teams)[:, None], order.shape)
+        np.put_along_axis(ranks, order, positions, axis=-2)
+        points = num_teams - ranks  # Higher value gets higher rank
+    elif ties == 'average':
+        lower = (values[..., None, :, :] < values[..., :, None, :]).sum(axis=-2)
+        equal = (values[..., None, :, :] == values[..., :, None, :]).sum(axis=-2)
+        points = lower + (equal + 1) / 2
+    else:
+        raise ValueError(f"Unknown tie policy: {ties}")
+    return points, points.sum(axis=-1)
+
+# Function to calculate roto standings
+def calculate_roto_standings(teams_stats):
+    teams = list(teams_stats.keys())
+    values = [[teams_stats[team].get(cat, 0) for cat in CATEGORIES] for team in teams]
+    points, _ = rank_roto_standings(values)
+    return {team: dict(zip(CATEGORIES, points[i].tolist())) for i, team in enumerate(teams)}
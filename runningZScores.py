@@ -0,0 +1,84 @@
+import numpy as np
+from playerStore import STAT_INDEX, availability_mask
+from playerData import Z_CATEGORIES
+
+# Function to compute each player's value in every category, players x categories
+# fg% and ft% are derived from makes and attempts like the loader does, so they are NaN
+# for a player without attempts.
+def category_values(matrix, categories):
+    columns = []
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for cat in categories:
+            if cat == 'fg%':
+                columns.append((matrix[:, STAT_INDEX['fgm']] / matrix[:, STAT_INDEX['fga']]) * 100)
+            elif cat == 'ft%':
+                columns.append((matrix[:, STAT_INDEX['ftm']] / matrix[:, STAT_INDEX['fta']]) * 100)
+            else:
+                columns.append(matrix[:, STAT_INDEX[cat]])
+    return np.column_stack(columns)
+
+# Class to keep z-scores of the remaining player pool up to date as players are drafted
+# Moments are a 3 x categories array of the pool's per-category count, sum and sum of
+# squares; removing a player subtracts that player's row, which is O(categories). Values
+# are centred on the full pool's means first so the sums stay accurate as the pool shrinks.
+# The engine's own moments track one pool (remove / restore); search code can instead keep
+# one moments array per state and pass it to the scoring methods.
+class RunningZScores:
+    def __init__(self, store, categories=Z_CATEGORIES):
+        # Counting stats first and percentages last, like the loader's total z-score
+        self.categories = [cat for cat in categories if cat not in ['fg%', 'ft%']] + ['fg%', 'ft%']
+        self.signs = np.array([-1.0 if cat == 'TOs' else 1.0 for cat in self.categories])  # Fewer turnovers are better
+        values = category_values(store.matrix, self.categories)
+        self.present = ~np.isnan(values)  # A missing value adds nothing to its category or the total
+        with np.errstate(invalid='ignore'):
+            self.shift = np.nan_to_num(np.nanmean(np.where(self.present, values, np.nan), axis=0))
+        self.values = np.where(self.present, values - self.shift, 0.0)
+        # Players x 3 x categories: what each player adds to the count, sum and sum of squares
+        self.contributions = np.stack([self.present.astype(np.float64), self.values, self.values ** 2], axis=1)
+        self.moments = self.contributions.sum(axis=0)
+
+    def __len__(self):
+        return len(self.values)
+
+    # Take a player out of (or put one back into) the engine's pool
+    def remove(self, player_id):
+        self.moments -= self.contributions[player_id]
+
+    def restore(self, player_id):
+        self.moments += self.contributions[player_id]
+
+    # Moments of a pool after one more player is removed, leaving the given moments unchanged
+    def without(self, moments, player_id):
+        return moments - self.contributions[player_id]
+
+    # Per-category mean (of the centred values) and sample standard deviation of a pool
+    # Categories with fewer than two players or no spread get a NaN deviation.
+    def mean_std(self, moments=None):
+        count, total, squares = self.moments if moments is None else moments
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = total / count
+            variance = np.maximum(squares - total * mean, 0) / (count - 1)
+        std = np.sqrt(variance)
+        std[(count < 2) | ~(std > 0)] = np.nan
+        return mean, std
+
+    # Per-category z-scores of the given players against a pool, players x categories
+    # Turnovers keep their sign here; NaN marks missing values and categories without spread.
+    def z_scores(self, player_ids, moments=None):
+        mean, std = self.mean_std(moments)
+        z_scores = (self.values[player_ids] - mean) / std
+        z_scores[~self.present[player_ids]] = np.nan
+        return z_scores
+
+    # Total z-scores of the given players against a pool
+    # With nothing removed these match the loader's total_z to within rounding.
+    def total_z(self, player_ids, moments=None):
+        z_scores = self.z_scores(player_ids, moments) * self.signs
+        return np.where(np.isnan(z_scores), 0.0, z_scores).sum(axis=1)
+
+    # First n available player IDs by total z-score against the pool they remain in
+    # Ties go to the lower player ID, like AvailabilityIndex's stable ordering.
+    def top_available(self, available, n, moments=None):
+        ids = np.flatnonzero(availability_mask(available, len(self)))
+        order = np.argsort(-self.total_z(ids, moments), kind='stable')[:n]
+        return ids[order].tolist()
@@ -0,0 +1,97 @@
+import json
+import sys
+import time
+from collections import defaultdict
+
+# Phases timed by the beam search
+TRACE_PHASES = ['selection', 'copying', 'sampling', 'aggregation', 'ranking', 'pruning']
+
+# Class to collect per-pick counters and phase timings from the beam search
+# Each finished pick becomes one record, appended to a JSONL file and/or passed to a callback.
+class SearchTrace:
+    def __init__(self, path=None, callback=None):
+        self.records = []
+        self.callback = callback
+        self.file = open(path, 'w') if path else None
+        self.current = None
+
+    # Begin a record for one pick of the draft sequence
+    def start_pick(self, pick_index, round_number, drafter, beam_size):
+        self.current = {
+            'pick': pick_index,
+            'round': round_number,
+            'drafter': drafter,
+            'beam_in': beam_size,
+            'states_generated': 0,
+            'states_pruned': 0,
+            'states_merged': 0,
+            'beam_out': 0,
+            'time': {phase: 0.0 for phase in TRACE_PHASES}
+        }
+
+    def add_time(self, phase, seconds):
+        self.current['time'][phase] += seconds
+
+    def count(self, counter, n=1):
+        self.current[counter] += n
+
+    # Close the current pick's record and emit it
+    def end_pick(self, beam_size):
+        record = self.current
+        record['beam_out'] = beam_size
+        self.records.append(record)
+        if self.file is not None:
+            self.file.write(json.dumps(record) + '\n')
+        if self.callback is not None:
+            self.callback(record)
+        self.current = None
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def summarize(self):
+        return summarize_trace(self.records)
+
+# Function to clock phases only when tracing is enabled
+def trace_clock(trace):
+    return time.perf_counter if trace is not None else no_clock
+
+def no_clock():
+    return 0.0
+
+# Function to read the pick records back from a trace file
+def load_trace(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# Function to total pick records per round and overall
+def summarize_trace(records):
+    rounds = defaultdict(lambda: {
+        'picks': 0, 'states_generated': 0, 'states_pruned': 0, 'states_merged': 0,
+        'time': {phase: 0.0 for phase in TRACE_PHASES}
+    })
+    for record in records:
+        for key in (record['round'], 'total'):
+            summary = rounds[key]
+            summary['picks'] += 1
+            summary['states_generated'] += record['states_generated']
+            summary['states_pruned'] += record['states_pruned']
+            summary['states_merged'] += record.get('states_merged', 0)
+            for phase, seconds in record['time'].items():
+                summary['time'][phase] = summary['time'].get(phase, 0.0) + seconds
+    return dict(rounds)
+
+# Function to print a per-round table of a trace summary
+def print_summary(summary):
+    print(f"{'round':>6} {'picks':>6} {'generated':>10} {'pruned':>8} {'merged':>8} " + ' '.join(f"{phase:>11}" for phase in TRACE_PHASES))
+    for key, row in sorted(summary.items(), key=lambda item: (item[0] == 'total', str(item[0]).zfill(4))):
+        print(f"{key:>6} {row['picks']:>6} {row['states_generated']:>10} {row['states_pruned']:>8} {row['states_merged']:>8} "
+              + ' '.join(f"{row['time'].get(phase, 0.0):>10.3f}s" for phase in TRACE_PHASES))
+
+if __name__ == "__main__":
+    # Summarize one or more trace files written by simulate_draft_beam_search
+    for trace_path in sys.argv[1:]:
+        print(trace_path)
+        print_summary(summarize_trace(load_trace(trace_path)))
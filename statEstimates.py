@@ -0,0 +1,56 @@
+import numpy as np
+
+FTr = 0.25  # Average league free throw rate
+
+# Columns estimated from ppg, fgp, ftp and 3pm, in the order estimate_shooting returns them
+ESTIMATED_FIELDS = ['ftm', 'fta', 'fgm', 'fga']
+# Columns the estimates are derived from
+ESTIMATE_INPUTS = ['ppg', 'fgp', 'ftp', '3pm']
+
+# Function to estimate FTM, FTA, FGM and FGA for a chunk of players
+def estimate_shooting(ppg, fgp, ftp, three_pm):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Step 1: Calculate Points from Three-Pointers
+        points_3pm = three_pm * 3
+
+        # Step 2: Calculate Adjusted PPG
+        adjusted_ppg = ppg - points_3pm
+
+        # Step 3: Calculate Coefficient C, avoiding division by zero
+        C = np.where(fgp == 0, 0.0, (FTr * ftp) / fgp)
+
+        # Step 4: Compute Denominator
+        denominator = 2 + C
+
+        # Steps 5 and 6: Calculate Two-Pointers Made, avoiding division by zero
+        numerator = adjusted_ppg - (three_pm * C)
+        two_pm = np.where(denominator == 0, 0.0, numerator / denominator)
+
+        # Ensure two_pm is not negative (same as max(two_pm, 0), which keeps NaN)
+        two_pm = np.where(0 > two_pm, 0.0, two_pm)
+
+        # Step 7: Calculate Field Goals Made (FGM)
+        fgm = three_pm + two_pm
+
+        # Step 8: Calculate Field Goals Attempted (FGA)
+        fga = np.where(fgp > 0, fgm / fgp, 0.0)
+
+        # Step 9: Calculate Free Throw Attempts (FTA)
+        fta = fga * FTr
+
+        # Step 10: Calculate Free Throws Made (FTM)
+        ftm = fta * ftp
+    return ftm, fta, fgm, fga
+
+# Function to round to 2 decimals exactly like Python's round(x, 2)
+# np.round scales by 100 first, which can tip values within an ulp of a half-cent (or too
+# large to scale exactly) the wrong way; those few go through Python's correctly rounded round().
+def round_2(values):
+    scaled = values * 100
+    rounded = np.round(values, 2)
+    with np.errstate(invalid='ignore'):
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+        near_half |= np.abs(scaled) >= 2 ** 52
+    for i in np.flatnonzero(near_half):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
@@ -0,0 +1,112 @@
+import json
+import os
+from datetime import datetime, timezone
+import numpy as np
+from statEstimates import ESTIMATED_FIELDS, ESTIMATE_INPUTS, estimate_shooting, round_2
+
+# Function to find the edit journal that belongs to a player CSV
+def journal_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.edits.jsonl'
+
+# Function to append one stat override to the journal
+# Each edit is flushed and fsynced, so an interrupted session keeps every edit entered.
+def append_edit(path, player, stat, value):
+    edit = {
+        'player': player,
+        'stat': stat,
+        'value': float(value),
+        'time': datetime.now(timezone.utc).isoformat()
+    }
+    with open(path, 'a') as f:
+        f.write(json.dumps(edit) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    return edit
+
+# Function to read the journal's edits in the order they were made
+def read_journal(path):
+    if not os.path.exists(path):
+        return []
+    edits = []
+    with open(path) as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break  # Partial last line from an interrupted write
+            if line.strip():
+                edits.append(json.loads(line))
+    return edits
+
+# Function to apply edits to a players x columns array in place, re-estimating only edited rows
+# row_for_player maps names to rows; edits for players not in it are skipped. Rows whose
+# ppg, fgp, ftp or 3pm changed get fresh makes/attempts estimates, rounded like cleanStats,
+# unless the journal sets that estimate directly. Returns the sorted rows that changed.
+def apply_edits(values, columns, row_for_player, edits):
+    column_index = {col: i for i, col in enumerate(columns)}
+    changed = set()
+    re_estimate = set()
+    explicit = set()  # (row, column) pairs set directly, which re-estimation keeps
+    for edit in edits:
+        row = row_for_player.get(edit['player'])
+        col = column_index.get(edit['stat'])
+        if row is None or col is None:
+            continue
+        values[row, col] = edit['value']
+        changed.add(row)
+        if edit['stat'] in ESTIMATE_INPUTS:
+            re_estimate.add(row)
+        elif edit['stat'] in ESTIMATED_FIELDS:
+            explicit.add((row, col))
+
+    rows = np.array(sorted(re_estimate), dtype=int)
+    if len(rows) and all(col in column_index for col in ESTIMATE_INPUTS):
+        inputs = [values[rows, column_index[col]] for col in ESTIMATE_INPUTS]
+        for field, estimate in zip(ESTIMATED_FIELDS, estimate_shooting(*inputs)):
+            if field not in column_index:
+                continue
+            col = column_index[field]
+            for row, value in zip(rows.tolist(), round_2(estimate).tolist()):
+                if (row, col) not in explicit:
+                    values[row, col] = value
+    return sorted(changed)
+
+# Function to apply edits to a DataFrame, touching only the edited players' rows
+# Only columns the frame has are edited; fg% and ft% are recomputed for changed rows if present.
+def apply_edits_to_frame(df, edits, columns):
+    columns = [col for col in columns if col in df.columns]
+    values = df[columns].to_numpy(dtype=np.float64, copy=True)
+    row_for_player = {}
+    for row, name in enumerate(df['Name'].tolist()):
+        row_for_player.setdefault(name, row)  # First row wins, like the player store
+    rows = apply_edits(values, columns, row_for_player, edits)
+    if not rows:
+        return rows
+    index = df.index[rows]
+    for i, col in enumerate(columns):
+        if np.array_equal(values[rows, i], df[col].to_numpy(dtype=np.float64)[rows], equal_nan=True):
+            continue
+        new_values = values[rows, i]
+        if df[col].dtype.kind in 'iu' and np.all(new_values == np.round(new_values)):
+            new_values = new_values.astype(df[col].dtype)  # Keep whole-number columns whole
+        elif df[col].dtype.kind != 'f':
+            df[col] = df[col].astype(np.float64)
+        df.loc[index, col] = new_values
+    if 'fg%' in df.columns:
+        df.loc[index, 'fg%'] = (df.loc[index, 'fgm'] / df.loc[index, 'fga']) * 100
+    if 'ft%' in df.columns:
+        df.loc[index, 'ft%'] = (df.loc[index, 'ftm'] / df.loc[index, 'fta']) * 100
+    return rows
+
+# Function to fold the journal into CSV files and start a new, empty journal
+# Each CSV is rewritten once, through a temporary file, with the edits to the columns it has.
+def compact_journal(path, csv_paths, columns):
+    import pandas as pd
+    edits = read_journal(path)
+    if edits:
+        for csv_path in csv_paths:
+            df = pd.read_csv(csv_path)
+            if apply_edits_to_frame(df, edits, columns):
+                temp_path = csv_path + '.tmp'
+                df.to_csv(temp_path, index=False)
+                os.replace(temp_path, csv_path)
+    open(path, 'w').close()
+    return len(edits)
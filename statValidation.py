@@ -0,0 +1,78 @@
+import numpy as np
+
+# Default tolerances for the consistency checks
+DEFAULT_TOLERANCES = {
+    'percentage': 0.01,  # Allow 1% difference between a percentage and makes / attempts
+    'ppg': 0.5           # Allow 0.5 points difference between ppg and the points from makes
+}
+
+# Columns every check needs; a row missing any of them fails the 'missing' check instead
+REQUIRED_COLUMNS = ['ftp', 'fgp', 'ppg', 'ftm', 'fta', 'fgm', 'fga', '3pm']
+
+# Checks in the order they are reported for a row
+CHECKS = ['missing', 'ftp', 'ftp_no_attempts', 'fgp', 'fgp_no_attempts', 'ppg']
+
+# Function to run the checks over stat columns (a dict of float arrays, NaN where missing)
+# Returns parallel arrays of failing rows, CHECKS indices, expected and computed values,
+# ordered by row and then check.
+def find_violations(values, num_rows, tolerances=None):
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    values = {col: values.get(col, np.full(num_rows, np.nan)) for col in REQUIRED_COLUMNS}
+    missing = np.zeros(num_rows, dtype=bool)
+    for col in REQUIRED_COLUMNS:
+        missing |= np.isnan(values[col])
+
+    found = []
+
+    def flag(check, failed, expected, computed):
+        rows = np.flatnonzero(failed)
+        found.append((rows, np.full(len(rows), CHECKS.index(check)),
+                      np.broadcast_to(expected, num_rows)[rows], np.broadcast_to(computed, num_rows)[rows]))
+
+    ftp, fgp, ppg = values['ftp'], values['fgp'], values['ppg']
+    ftm, fta, fgm, fga, three_pm = values['ftm'], values['fta'], values['fgm'], values['fga'], values['3pm']
+    present = ~missing
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Free Throw Percentage Check
+        calculated_ftp = ftm / fta
+        flag('ftp', present & (fta != 0) & (np.abs(calculated_ftp - ftp) > tolerances['percentage']), ftp, calculated_ftp)
+        flag('ftp_no_attempts', present & (fta == 0) & (ftp != 0), ftp, np.nan)
+
+        # Field Goal Percentage Check
+        calculated_fgp = fgm / fga
+        flag('fgp', present & (fga != 0) & (np.abs(calculated_fgp - fgp) > tolerances['percentage']), fgp, calculated_fgp)
+        flag('fgp_no_attempts', present & (fga == 0) & (fgp != 0), fgp, np.nan)
+
+        # Points Per Game Check: threes, twos and free throws
+        total_points = three_pm * 3 + (fgm - three_pm) * 2 + ftm
+        flag('ppg', present & (np.abs(total_points - ppg) > tolerances['ppg']), ppg, total_points)
+    flag('missing', missing, np.nan, np.nan)
+
+    rows, checks, expected, computed = (np.concatenate(parts) for parts in zip(*found))
+    order = np.lexsort((checks, rows))
+    return rows[order], checks[order], expected[order], computed[order]
+
+# Function to check every row's percentages and points against its makes and attempts
+# Returns a violations table with one row per failed check: the source row, player, check
+# name, the stat's value in the file (expected) and the value implied by the other stats
+# (computed, NaN when there is nothing to compute from).
+def validate_stats(df, tolerances=None):
+    import pandas as pd  # The checks themselves only need numpy
+    values = {col: pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+              for col in REQUIRED_COLUMNS if col in df.columns}
+    rows, checks, expected, computed = find_violations(values, len(df), tolerances)
+    names = df['Name'].to_numpy() if 'Name' in df.columns else np.full(len(df), None)
+    return pd.DataFrame({
+        'row': rows,
+        'player': names[rows],
+        'check': np.array(CHECKS, dtype=object)[checks],
+        'expected': expected,
+        'computed': computed
+    })
+
+# Function to split a frame into the rows that pass every check and the violations found
+def quarantine_rows(df, tolerances=None):
+    violations = validate_stats(df, tolerances)
+    bad = np.zeros(len(df), dtype=bool)
+    bad[violations['row'].to_numpy()] = True
+    return df[~bad].reset_index(drop=True), violations